@@ -13,21 +13,55 @@ RESPONSABILIDADES:
     - Tratamento de código de saída do sistema
     - Gerenciamento de interrupções do usuário
 
+DESEMPENHO:
+    - O custo de inicialização é dominado por imports; argparse só é importado
+      quando os argumentos fogem do caso comum (sem argumentos ou --site N)
+    - Numba/JIT não se aplica: não há código numérico, apenas I/O de terminal
+
 """
 
 import sys
-import argparse
+from typing import NamedTuple, Optional
 
 from src.ui.terminal import run_brazilian_sites_terminal
 
 
-def main() -> int:
-    """Main application entry point."""
-    # Parse command line arguments
+class CliArgs(NamedTuple):
+    """Parsed command line arguments (immutable)."""
+    site: Optional[int] = None
+
+
+# Valid values for --site, used by the fast argument path
+_SITE_CHOICES = {'1': 1, '2': 2, '3': 3}
+
+
+def parse_arguments(argv=None) -> CliArgs:
+    """Parse command line arguments, skipping argparse for the common cases."""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Fast path: no arguments, "--site N" or "--site=N" with a valid site
+    if not argv:
+        return CliArgs()
+    if len(argv) == 2 and argv[0] == '--site' and argv[1] in _SITE_CHOICES:
+        return CliArgs(site=_SITE_CHOICES[argv[1]])
+    if len(argv) == 1 and argv[0].startswith('--site='):
+        value = argv[0][len('--site='):]
+        if value in _SITE_CHOICES:
+            return CliArgs(site=_SITE_CHOICES[value])
+    
+    # Anything else (--help, invalid or unknown flags) goes through argparse
+    import argparse
     parser = argparse.ArgumentParser(description='Brazilian Government Sites Web Scraper')
     parser.add_argument('--site', type=int, choices=[1, 2, 3], 
                        help='Run specific site: 1=Portal Saude MG, 2=MDS Parcelas, 3=MDS Saldo')
-    args = parser.parse_args()
+    return CliArgs(site=parser.parse_args(argv).site)
+
+
+def main() -> int:
+    """Main application entry point."""
+    # Parse command line arguments
+    args = parse_arguments()
     
     try:
         # Run the main application
@@ -3,12 +3,23 @@ Municipality name corrector using AI with web search capabilities.
 Validates and corrects municipality names for Brazilian states.
 """
 
+import re
 from typing import Optional
 from src.ai.openai_client import OpenAIClient
 from src.utils.logger import logger
 from functools import lru_cache
 
 
+# Pre-compiled pattern used to strip markdown links from the AI response
+_MARKDOWN_LINK = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+
+# Translation table that deletes leftover markdown formatting characters
+_MARKDOWN_CHARS = str.maketrans('', '', '#*_`')
+
+# Line prefixes that mark markdown headers, links or bare URLs
+_SKIP_LINE_PREFIXES = ('#', '[', 'http')
+
+
 class MunicipalityCorrector:
     """Corrects municipality names using AI with web search."""
     
@@ -99,16 +110,15 @@ Resposta:"""
                 lines = result.split('\n')
                 for line in lines:
                     clean_line = line.strip()
-                    if clean_line and not clean_line.startswith('#') and not clean_line.startswith('[') and not clean_line.startswith('http'):
+                    if clean_line and not clean_line.startswith(_SKIP_LINE_PREFIXES):
                         result = clean_line
                         break
             
             # Remove markdown links [text](url)
-            import re
-            result = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', result)
+            result = _MARKDOWN_LINK.sub(r'\1', result)
             
             # Remove any remaining markdown formatting
-            result = re.sub(r'[#*_`]', '', result)
+            result = result.translate(_MARKDOWN_CHARS)
             
             # Clean quotes and extra whitespace
             result = result.strip().strip('"').strip("'").strip()
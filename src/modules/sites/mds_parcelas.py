@@ -11,6 +11,7 @@ import time
 import os
 import csv
 import glob
+import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
@@ -43,6 +44,13 @@ class MDSParcelasScraper:
         self.wait_timeout = 30
         self.ajax_wait_time = 5  # Seconds to wait for AJAX requests
         self.session_start_time = None
+        # Set from the UI thread to stop between years/municipalities
+        self._cancel_event = threading.Event()
+        
+    def cancel(self):
+        """Request cancellation; the scraper stops at the next year/municipality boundary."""
+        logger.info("Cancellation requested for MDS Parcelas scraping")
+        self._cancel_event.set()
         
     def execute_scraping(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -87,6 +95,8 @@ class MDSParcelasScraper:
                 start_year = year_config['start_year']
                 end_year = year_config['end_year']
                 for year in range(start_year, end_year + 1):
+                    if self._cancel_event.is_set():
+                        break
                     logger.info(f"Processing year {year}")
                     result = self._process_single_year(year, uf, municipality)
                     downloaded_files.extend(result.get('files', []))
@@ -96,12 +106,17 @@ class MDSParcelasScraper:
             elif year_config.get('type') == 'multiple':
                 # Multiple specific years
                 for year in year_config['years']:
+                    if self._cancel_event.is_set():
+                        break
                     logger.info(f"Processing year {year}")
                     result = self._process_single_year(year, uf, municipality)
                     downloaded_files.extend(result.get('files', []))
                     total_records += result.get('records', 0)
                     errors.extend(result.get('errors', []))
             
+            if self._cancel_event.is_set():
+                errors.append("Cancelled by user")
+            
             # Calculate statistics
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
@@ -206,6 +221,8 @@ class MDSParcelasScraper:
                 logger.info(f"Processing {len(municipalities)} municipalities for {uf}")
                 
                 for mun_name, mun_value in municipalities:
+                    if self._cancel_event.is_set():
+                        break
                     logger.info(f"Processing municipality: {mun_name}")
                     result = self._process_single_municipality(
                         year, uf, mun_name, mun_value
@@ -394,14 +394,17 @@ class PortalSaudeMGScraper:
             title_links = self.driver.find_elements(By.CSS_SELECTOR, "h2.title > a")
             
             pdf_links = []
+            seen_urls = set()
             
             for link in title_links:
                 try:
                     href = link.get_attribute("href")
                     text = link.text.strip()
                     
-                    # Collect all links with valid href (no name filtering)
-                    if href and text:
+                    # Collect all links with valid href (no name filtering),
+                    # skipping duplicate URLs while keeping page order
+                    if href and text and href not in seen_urls:
+                        seen_urls.add(href)
                         pdf_links.append({
                             'url': href,
                             'title': text,
@@ -413,16 +416,8 @@ class PortalSaudeMGScraper:
                     logger.debug(f"Erro ao processar link: {e}")
                     continue
             
-            # Remove duplicates based on URL
-            seen_urls = set()
-            unique_links = []
-            for link in pdf_links:
-                if link['url'] not in seen_urls:
-                    seen_urls.add(link['url'])
-                    unique_links.append(link)
-            
-            logger.info(f"Coletados {len(unique_links)} links únicos de documentos")
-            return unique_links
+            logger.info(f"Coletados {len(pdf_links)} links únicos de documentos")
+            return pdf_links
             
         except Exception as e:
             error_msg = f"Erro ao coletar links de PDFs: {str(e)}"
@@ -0,0 +1,149 @@
+"""
+Raw-mode line reader shared by the MDS UIs (Unix terminals).
+Bytes go through a small state machine so that a lone ESC (go back) can be told
+apart from arrow/function key sequences, which are dropped.
+"""
+
+import os
+import select
+from typing import Optional
+
+
+# Reader states: plain input, right after ESC, inside a CSI/SS3 sequence
+_KEY_NORMAL, _KEY_ESC, _KEY_CSI = range(3)
+_KEY_DONE = -1  # Enter pressed, line complete
+
+
+def _key_escape(byte: int, chars: bytearray, echo: bytearray) -> int:
+    """ESC: wait for the rest of a possible escape sequence."""
+    return _KEY_ESC
+
+
+def _key_enter(byte: int, chars: bytearray, echo: bytearray) -> int:
+    """Enter (LF or CR): finish the line."""
+    return _KEY_DONE
+
+
+def _key_backspace(byte: int, chars: bytearray, echo: bytearray) -> int:
+    """Backspace: drop the last character (all its UTF-8 bytes) and queue its erase."""
+    if chars:
+        # Continuation bytes are 0b10xxxxxx; pop them along with the lead byte
+        while len(chars) > 1 and chars[-1] & 0xC0 == 0x80:
+            chars.pop()
+        chars.pop()
+        echo.extend(b'\b \b')
+    return _KEY_NORMAL
+
+
+def _key_printable(byte: int, chars: bytearray, echo: bytearray) -> int:
+    """Regular character byte; UTF-8 sequences are kept raw and decoded at the end."""
+    if byte >= 32:
+        chars.append(byte)
+        echo.append(byte)
+    return _KEY_NORMAL
+
+
+# Byte -> handler for plain input; anything else goes to _key_printable
+_KEY_HANDLERS = {
+    27: _key_escape,
+    10: _key_enter,
+    13: _key_enter,
+    127: _key_backspace,
+}
+
+
+def _key_state_normal(byte: int, chars: bytearray, echo: bytearray) -> int:
+    return _KEY_HANDLERS.get(byte, _key_printable)(byte, chars, echo)
+
+
+def _key_state_escape(byte: int, chars: bytearray, echo: bytearray) -> int:
+    # '[' starts a CSI sequence (arrow keys, function keys, etc.) and 'O' an SS3 one
+    # (arrows in application mode, F1-F4); other bytes are dropped
+    return _KEY_CSI if byte in (0x5B, 0x4F) else _KEY_NORMAL
+
+
+def _key_state_csi(byte: int, chars: bytearray, echo: bytearray) -> int:
+    # CSI/SS3 sequences end with a final byte in 0x40-0x7E
+    return _KEY_NORMAL if 0x40 <= byte <= 0x7E else _KEY_CSI
+
+
+# State -> transition function
+_KEY_STATES = {
+    _KEY_NORMAL: _key_state_normal,
+    _KEY_ESC: _key_state_escape,
+    _KEY_CSI: _key_state_csi,
+}
+
+
+def read_line(fd: int, out_fd: int, pending: bytearray) -> Optional[str]:
+    """
+    Read one line from the terminal fd in raw mode, echoing to out_fd.
+    Returns None when ESC was pressed on its own. pending holds bytes read past
+    Enter (a pasted next answer): they are consumed first and refilled on return.
+    Raises ImportError where termios is unavailable.
+    """
+    import termios
+    import tty
+
+    old_settings = termios.tcgetattr(fd)
+    try:
+        # TCSADRAIN (not setraw's default TCSAFLUSH) keeps keys already queued for this prompt
+        tty.setraw(fd, termios.TCSADRAIN)
+
+        # setraw already blocks in the kernel until a byte arrives (VMIN=1, VTIME=0)
+        blocking_mode = termios.tcgetattr(fd)
+
+        # Short timeout (100ms) used only to tell ESC from an escape sequence
+        escape_mode = termios.tcgetattr(fd)
+        escape_mode[6][termios.VMIN] = 0
+        escape_mode[6][termios.VTIME] = 1
+
+        # Raw bytes straight from the fd, decoded once when the line is complete
+        chars = bytearray()
+        echo = bytearray()
+
+        state = _KEY_NORMAL
+        while state != _KEY_DONE:
+            if pending:
+                data = bytes(pending)
+                pending.clear()
+            elif state == _KEY_NORMAL:
+                # Whatever is buffered arrives in one read (pastes included)
+                data = os.read(fd, 64)
+            else:
+                # Rest of a possible escape sequence in one burst
+                termios.tcsetattr(fd, termios.TCSANOW, escape_mode)
+                try:
+                    data = os.read(fd, 64)
+                finally:
+                    termios.tcsetattr(fd, termios.TCSANOW, blocking_mode)
+
+                if not data:
+                    if state == _KEY_ESC:
+                        return None  # Real ESC key
+                    state = _KEY_NORMAL  # Truncated sequence: drop it
+                    continue
+
+            # Bytes after a sequence's final byte are handled as normal keys
+            for i, byte in enumerate(data):
+                state = _KEY_STATES[state](byte, chars, echo)
+                if state == _KEY_DONE:
+                    # Keys that arrived after Enter in the same burst belong to the next prompt
+                    rest = data[i + 1:]
+                    if byte == 13:
+                        if not rest and select.select([fd], [], [], 0)[0]:
+                            rest = os.read(fd, 64)  # A pasted CRLF: the LF is already queued
+                        if rest[:1] == b'\n':
+                            rest = rest[1:]
+                    pending += rest
+                    break
+
+            # One echo write per burst
+            if echo:
+                os.write(out_fd, echo)
+                echo.clear()
+
+        return chars.decode('utf-8', 'ignore').strip()
+
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
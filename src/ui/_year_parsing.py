@@ -0,0 +1,66 @@
+"""
+Year input parsing shared by the MDS UIs.
+Each parser returns (result, error_msg): result is None when the input is invalid,
+and error_msg is the message the UI should show through terminal.show_error.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+
+def parse_single(s: str, lo: int, hi: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Parse a single year and check it against the [lo, hi] bounds."""
+    try:
+        year = int(s)
+    except ValueError:
+        return None, "Entrada invalida. Digite um numero ou opcao valida."
+
+    if year < lo:
+        return None, f"Ano deve ser igual ou maior que {lo}."
+    if year > hi:
+        return None, f"Ano deve ser menor ou igual a {hi}."
+
+    return {'type': 'single', 'year': year}, None
+
+
+def parse_year(s: str, lo: int, hi: int, label: str) -> Tuple[Optional[int], Optional[str]]:
+    """Parse one field of a year range and check it against the [lo, hi] bounds."""
+    try:
+        year = int(s)
+    except ValueError:
+        return None, f"{label} inválido."
+
+    if year < lo:
+        return None, f"{label} deve ser igual ou maior que {lo}."
+    if year > hi:
+        return None, f"{label} deve ser menor ou igual a {hi}."
+
+    return year, None
+
+
+def parse_range(start_year: int, end_year: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Build a range config from two already validated years."""
+    if start_year > end_year:
+        return None, "Ano de início deve ser menor ou igual ao ano de fim."
+
+    return {'type': 'range', 'start_year': start_year, 'end_year': end_year}, None
+
+
+def parse_multiple(csv: str, lo: int, hi: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Parse comma-separated years into a sorted, de-duplicated multiple config."""
+    try:
+        # Removing duplicates and sorting in one pass; blank entries are ignored
+        years = sorted({int(y) for y in csv.split(',') if y.strip()})
+    except ValueError:
+        return None, "Formato inválido. Use números separados por vírgula (ex: 2020, 2022, 2024)."
+
+    if not years:
+        return None, "Pelo menos um ano válido deve ser informado."
+
+    # Sorted list: only the endpoints need to be checked against the bounds
+    if years[0] < lo:
+        return None, f"Ano {years[0]} deve ser igual ou maior que {lo}."
+    if years[-1] > hi:
+        return None, f"Ano {years[-1]} deve ser menor ou igual a {hi}."
+
+    # Joined once here for the confirmation message
+    return {'type': 'multiple', 'years': years, 'years_str': ', '.join(map(str, years))}, None
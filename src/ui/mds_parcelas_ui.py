@@ -9,12 +9,171 @@ de ano, estado (UF) e município.
 import sys
 import os
 import time
+import queue
+import subprocess
+import selectors
 import threading
-from typing import Dict, List, Optional, Any
+import functools
+from typing import Dict, List, NamedTuple, Optional, Any, Union
 from datetime import datetime
 
 from src.utils.logger import logger, set_context
 from src.ai.municipality_corrector import get_municipality_corrector
+from src.ui._raw_keys import read_line
+from src.ui._year_parsing import parse_single, parse_year, parse_range, parse_multiple
+
+
+# Primeiro ano com dados disponíveis
+_MIN_YEAR = 2006
+
+class AllMunicipalities(NamedTuple):
+    """Municipality filter meaning "every municipality of the state"."""
+    uf: str
+    
+    def __str__(self) -> str:
+        # Encoding understood by the scraper ('ALL_<UF>')
+        return f"ALL_{self.uf}"
+
+
+# Seconds to wait for the scraper to close the browser after a forced (second) Ctrl+C
+_CANCEL_JOIN_TIMEOUT = 10.0
+
+# Maximum number of formatted filter/summary strings kept
+_SUMMARY_CACHE_SIZE = 16
+
+# Marks a config key that is absent (distinct from a key set to None)
+_MISSING = object()
+
+
+def _year_key(year_config: Optional[Dict[str, Any]]) -> Optional[tuple]:
+    """Build a hashable signature of a year_config dict."""
+    if not year_config:
+        return None
+    return (
+        year_config.get('type'),
+        year_config.get('year'),
+        year_config.get('start_year'),
+        year_config.get('end_year'),
+        tuple(year_config.get('years', ())),
+    )
+
+
+def _years_part(year_key: Optional[tuple]) -> Optional[str]:
+    """Format the year filter from a _year_key signature (None when unset)."""
+    if not year_key:
+        return None
+    kind, year, start_year, end_year, years = year_key
+    if kind == 'single':
+        return f"Ano: {year}"
+    if kind == 'range':
+        return f"Anos: {start_year}-{end_year}"
+    if kind == 'multiple':
+        return f"Anos: {', '.join(map(str, years))}"
+    return None
+
+
+def _filter_parts(year_key: Optional[tuple], uf, municipality) -> List[str]:
+    """Format each selected filter as a 'Label: value' string."""
+    filters = []
+    
+    years = _years_part(year_key)
+    if years:
+        filters.append(years)
+    
+    if uf:
+        filters.append(f"Estado: {uf}")
+    
+    if municipality:
+        if isinstance(municipality, AllMunicipalities):
+            filters.append(f"Município: Todos de {municipality.uf}")
+        else:
+            filters.append(f"Município: {municipality}")
+    
+    return filters
+
+
+@functools.lru_cache(maxsize=_SUMMARY_CACHE_SIZE)
+def _selected_filters_line(year_key: Optional[tuple], uf, municipality) -> str:
+    """Build the selected filters line (empty when nothing is selected)."""
+    filters = _filter_parts(year_key, uf, municipality)
+    return "Filtros selecionados: " + " | ".join(filters) if filters else ""
+
+
+@functools.lru_cache(maxsize=_SUMMARY_CACHE_SIZE)
+def _config_summary(year_key: Optional[tuple], uf, municipality) -> str:
+    """Build the configuration summary; uf/municipality are _MISSING when absent from the config."""
+    parts = []
+    
+    years = _years_part(year_key)
+    if years:
+        parts.append(years)
+    
+    if uf is not _MISSING:
+        parts.append(f"UF: {uf}")
+    
+    if municipality is not _MISSING:
+        if isinstance(municipality, AllMunicipalities):
+            parts.append(f"Municipio: Todos de {municipality.uf}")
+        else:
+            parts.append(f"Municipio: {municipality}")
+    
+    return ", ".join(parts)
+
+
+# Static error logs screen, written in a single call
+_ERROR_LOGS_SCREEN = (
+    "========================================\n"
+    "         LOGS DE ERRO\n"
+    "========================================\n"
+    "\n"
+    "Logs detalhados salvos em: logs/\n"
+    "\n"
+    "Para análise técnica, verifique os arquivos de log.\n"
+    "Os logs contêm informações detalhadas sobre:\n"
+    "- Conexões com o site\n"
+    "- Autenticação\n"
+    "- Aplicação de filtros\n"
+    "- Erros de parsing\n"
+    "- Stack traces completos\n"
+    "\n"
+)
+
+
+# Static parts of the configuration screen, around the selected filters line
+_CONFIG_HEADER = (
+    "========================================\n"
+    "      MDS - PARCELAS PAGAS\n"
+    "========================================\n"
+    "\n"
+)
+_CONFIG_INTRO = (
+    "Site: aplicacoes.mds.gov.br/suaswebcons\n"
+    "\n"
+    "Configure os filtros para consulta:\n"
+    "\n"
+)
+_CONFIG_ACTIONS = (
+    "✓ Todos os filtros configurados!\n"
+    "\n"
+    "1. Iniciar coleta\n"
+    "2. Modificar ano\n"
+    "3. Modificar estado\n"
+    "4. Modificar município\n"
+    "5. Voltar ao menu principal\n"
+    "\n"
+)
+
+
+# Process steps shown by the progress display, in screen order
+_PROGRESS_STEPS = (
+    "Conectando ao site MDS",
+    "Fazendo autenticação",
+    "Aplicando filtros",
+    "Coletando dados",
+    "Processando informações",
+    "Salvando resultados",
+    "Finalizando"
+)
 
 
 class InteractiveProgressDisplay:
@@ -40,6 +199,7 @@ class InteractiveProgressDisplay:
         self.running = False
         self.update_thread = None
         self.lock = threading.Lock()
+        self._stop_event = threading.Event()  # Wakes the update loop on stop()
         
         # Display state
         self.last_timer_line = ""
@@ -47,16 +207,22 @@ class InteractiveProgressDisplay:
         self.steps_start_line = 10
         self.first_render = False
         
+        # Text currently on screen for each step, so updates only touch changed rows
+        self._step_rows = [self.steps_start_line + i for i in range(len(_PROGRESS_STEPS))]
+        self._step_lines = [""] * len(_PROGRESS_STEPS)
+        
     def start(self):
         """Start the real-time update thread."""
         if not self.running:
             self.running = True
+            self._stop_event.clear()
             self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
             self.update_thread.start()
     
     def stop(self):
         """Stop the real-time update thread."""
         self.running = False
+        self._stop_event.set()
         if self.update_thread:
             self.update_thread.join(timeout=1)
     
@@ -67,10 +233,35 @@ class InteractiveProgressDisplay:
             self.current_detail = detail
             if completed_steps:
                 self.steps_completed = completed_steps
+            
+            # After the first render only the step rows that changed are rewritten
+            if self.first_render:
+                for index, step_name in enumerate(_PROGRESS_STEPS):
+                    line = self._step_line(step_name)
+                    if line != self._step_lines[index]:
+                        self.update_step(index, line)
+                return
         
-        # Full render only on step changes
         self._full_render()
     
+    def update_step(self, index: int, line: str):
+        """Rewrite a single step row in place (caller holds the lock)."""
+        sys.stdout.write(f"\033[{self._step_rows[index]};1H{line}\033[0K\033[20;1H")
+        sys.stdout.flush()
+        self._step_lines[index] = line
+    
+    def _step_line(self, step_name: str) -> str:
+        """Build the display line for a step from the current state."""
+        if step_name in self.steps_completed:
+            return f"✓ {step_name}"
+        if step_name == self.current_step:
+            animation = self.animation_frames[self.animation_index]
+            step_line = f"⋯ {step_name}{animation}"
+            if self.current_detail:
+                step_line += f" ({self.current_detail})"
+            return step_line
+        return f"  {step_name}"
+    
     def get_elapsed_time(self) -> float:
         """Get elapsed time in minutes since start."""
         elapsed = datetime.now() - self.start_time
@@ -88,7 +279,9 @@ class InteractiveProgressDisplay:
                 self._update_animation()
                 self.last_animation_update = current_time
             
-            time.sleep(0.5)
+            # Sleep until the next tick, returning at once if stop() is called
+            if self._stop_event.wait(0.5):
+                break
     
     def _update_timer(self):
         """Update only the timer line."""
@@ -120,33 +313,10 @@ class InteractiveProgressDisplay:
         """Update only the line with the current active step."""
         if not self.first_render:
             return
-            
-        all_steps = [
-            "Conectando ao site MDS",
-            "Fazendo autenticação",
-            "Aplicando filtros",
-            "Coletando dados",
-            "Processando informações",
-            "Salvando resultados",
-            "Finalizando"
-        ]
-        
-        if self.current_step in all_steps:
-            step_index = all_steps.index(self.current_step)
-            line_number = self.steps_start_line + step_index
-            
-            # Build the step line with animation
-            animation = self.animation_frames[self.animation_index]
-            step_line = f"⋯ {self.current_step}{animation}"
-            
-            # Add detail if available
-            if self.current_detail:
-                step_line += f" ({self.current_detail})"
-            
-            # Move cursor to step line and update
-            print(f"\033[{line_number};1H\033[K{step_line}", end='', flush=True)
-            # Move cursor to bottom to avoid interference
-            print(f"\033[20;1H", end='', flush=True)
+        
+        if self.current_step in _PROGRESS_STEPS:
+            step_index = _PROGRESS_STEPS.index(self.current_step)
+            self.update_step(step_index, self._step_line(self.current_step))
     
     def _full_render(self):
         """Render the complete interface."""
@@ -171,31 +341,12 @@ class InteractiveProgressDisplay:
         # Show process steps
         print("Etapas do processo:")
         
-        all_steps = [
-            "Conectando ao site MDS",
-            "Fazendo autenticação",
-            "Aplicando filtros",
-            "Coletando dados",
-            "Processando informações",
-            "Salvando resultados",
-            "Finalizando"
-        ]
-        
-        for step_name in all_steps:
-            if step_name in self.steps_completed:
-                print(f"✓ {step_name}")
-            elif step_name == self.current_step:
-                # Initial render with animation
-                animation = self.animation_frames[self.animation_index]
-                step_line = f"⋯ {step_name}{animation}"
-                if self.current_detail:
-                    step_line += f" ({self.current_detail})"
-                print(step_line)
-            else:
-                print(f"  {step_name}")
+        for index, step_name in enumerate(_PROGRESS_STEPS):
+            self._step_lines[index] = self._step_line(step_name)
+            print(self._step_lines[index])
         
         print("")
-        print("Pressione Ctrl+C para cancelar")
+        print("Pressione Q, ESC ou Ctrl+C para cancelar")
         
         # Mark first render as complete and position cursor safely
         self.first_render = True
@@ -224,9 +375,8 @@ class InteractiveProgressDisplay:
         # Handle municipality
         if 'municipality' in self.config:
             municipality = self.config['municipality']
-            if municipality.startswith('ALL_'):
-                uf = municipality.split('_')[1]
-                parts.append(f"Município: Todos de {uf}")
+            if isinstance(municipality, AllMunicipalities):
+                parts.append(f"Município: Todos de {municipality.uf}")
             else:
                 parts.append(f"Município: {municipality}")
         
@@ -238,6 +388,33 @@ class MDSParcelasUI:
     Interface do usuário específica para MDS Parcelas Pagas.
     """
     
+    # Estados brasileiros válidos (ordem de exibição)
+    VALID_STATES_ORDERED = (
+        'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA',
+        'MT', 'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI', 'RJ', 'RN',
+        'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
+    )
+    VALID_STATES_DISPLAY = ', '.join(VALID_STATES_ORDERED)
+    
+    # Every casing of every UF ('MG', 'mg', 'Mg', 'mG') mapped to the canonical sigla
+    _UF_NORMALIZE = {
+        a + b: uf
+        for uf in VALID_STATES_ORDERED
+        for a in (uf[0], uf[0].lower())
+        for b in (uf[1], uf[1].lower())
+    }
+    
+    # Scraper class, imported lazily on first run and reused afterwards
+    _scraper_cls = None
+    
+    @classmethod
+    def _get_scraper_cls(cls):
+        """Import the scraper class once and cache it on the class."""
+        if cls._scraper_cls is None:
+            from src.modules.sites.mds_parcelas import MDSParcelasScraper
+            cls._scraper_cls = MDSParcelasScraper
+        return cls._scraper_cls
+    
     def __init__(self, terminal_instance):
         self.terminal = terminal_instance
         self.ESC_PRESSED = "__ESC_PRESSED__"
@@ -250,12 +427,16 @@ class MDSParcelasUI:
             'handler': 'mds_parcelas'
         }
         
-        # Estados brasileiros válidos
-        self.valid_states = [
-            'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA',
-            'MT', 'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI', 'RJ', 'RN',
-            'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
-        ]
+        # Latest selectable year, resolved once per UI instead of per prompt
+        self._max_year = datetime.now().year
+        
+        # Stdin registered once for readiness checks (created on first cancel-key poll)
+        self._selector = None
+        self._saved_tty = None  # Terminal mode saved while polling for cancel keys
+        self._pending_keys = bytearray()  # Bytes read past Enter, consumed by the next prompt
+        
+        # (config signature, session id) of the last run, reused when retrying
+        self._last_session = None
     
     def _get_key_input(self, prompt: str) -> str:
         """Get user input with ESC detection support."""
@@ -276,61 +457,19 @@ class MDSParcelasUI:
                 return self.ESC_PRESSED
             return user_input
     
+    def _get_selector(self, fd: int) -> selectors.BaseSelector:
+        """Create the stdin selector on first use and reuse it afterwards."""
+        if self._selector is None:
+            selector = selectors.DefaultSelector()
+            selector.register(fd, selectors.EVENT_READ)
+            self._selector = selector
+        return self._selector
+    
     def _get_key_unix(self) -> str:
         """Unix/Linux/macOS key detection."""
         try:
-            # Import Unix-specific modules only when needed
-            import termios
-            import tty
-            import select
-            
-            old_settings = termios.tcgetattr(sys.stdin)
-            try:
-                tty.setraw(sys.stdin.fileno())
-                
-                # Read input character by character
-                chars = []
-                while True:
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        char = sys.stdin.read(1)
-                        
-                        # ESC key (ASCII 27)
-                        if ord(char) == 27:
-                            # Check if it's a real ESC or part of escape sequence
-                            if select.select([sys.stdin], [], [], 0.1)[0]:
-                                # It's an escape sequence, consume it
-                                next_char = sys.stdin.read(1)
-                                if next_char == '[':
-                                    # Arrow keys, function keys, etc.
-                                    sys.stdin.read(1)  # consume the rest
-                                    continue
-                            else:
-                                # Real ESC key
-                                return self.ESC_PRESSED
-                        
-                        # Enter key
-                        elif ord(char) in [10, 13]:  # \n or \r
-                            break
-                        
-                        # Backspace
-                        elif ord(char) == 127:
-                            if chars:
-                                chars.pop()
-                                sys.stdout.write('\b \b')
-                                sys.stdout.flush()
-                        
-                        # Regular character
-                        elif ord(char) >= 32:  # Printable characters
-                            chars.append(char)
-                            sys.stdout.write(char)
-                            sys.stdout.flush()
-                
-                print()  # New line after input
-                return ''.join(chars).strip()
-                
-            finally:
-                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-        
+            sys.stdout.flush()  # Prompt must reach the screen before raw echo
+            line = read_line(sys.stdin.fileno(), sys.stdout.fileno(), self._pending_keys)
         except (ImportError, ModuleNotFoundError, OSError):
             # Fallback: aceitar tanto ESC físico quanto 'esc' digitado
             print("(Digite 'esc' para voltar)")
@@ -338,6 +477,12 @@ class MDSParcelasUI:
             if user_input == 'esc':
                 return self.ESC_PRESSED
             return user_input
+        
+        if line is None:
+            return self.ESC_PRESSED
+        
+        print()  # New line after input
+        return line
     
     def _get_key_windows(self) -> str:
         """Windows key detection - fallback to regular input with ESC simulation."""
@@ -383,31 +528,17 @@ class MDSParcelasUI:
     
     def show_selected_filters(self, year_config=None, uf=None, municipality=None):
         """Mostra os filtros já selecionados no topo da tela."""
-        filters = []
-        
-        if year_config:
-            if year_config.get('type') == 'single':
-                filters.append(f"Ano: {year_config['year']}")
-            elif year_config.get('type') == 'range':
-                filters.append(f"Anos: {year_config['start_year']}-{year_config['end_year']}")
-            elif year_config.get('type') == 'multiple':
-                years_str = ', '.join(map(str, year_config['years']))
-                filters.append(f"Anos: {years_str}")
-        
-        if uf:
-            filters.append(f"Estado: {uf}")
-        
-        if municipality:
-            if municipality.startswith('ALL_'):
-                state = municipality.split('_')[1]
-                filters.append(f"Município: Todos de {state}")
-            else:
-                filters.append(f"Município: {municipality}")
+        line = _selected_filters_line(_year_key(year_config), uf, municipality)
         
-        if filters:
-            print("Filtros selecionados: " + " | ".join(filters))
+        if line:
+            print(line)
             print("")
-
+    
+    def _show_filter_added(self, year_config=None, uf=None, municipality=None):
+        """Print just the filter that was selected, without repainting the screen."""
+        print("✓ " + " | ".join(_filter_parts(_year_key(year_config), uf, municipality)))
+        print("")
+    
     def show_config_screen(self) -> Optional[Dict[str, Any]]:
         """Show MDS Parcelas Pagas configuration screen."""
         year_config = None
@@ -415,17 +546,17 @@ class MDSParcelasUI:
         municipality = None
         self._temp_year_config = None  # Store year config for municipality input
         
+        needs_full_repaint = True
+        
         while True:
-            self.terminal.clear_screen()
-            print("========================================")
-            print("      MDS - PARCELAS PAGAS")
-            print("========================================")
-            print("")
-            self.show_selected_filters(year_config, uf, municipality)
-            print("Site: aplicacoes.mds.gov.br/suaswebcons")
-            print("")
-            print("Configure os filtros para consulta:")
-            print("")
+            # Full repaint only when entering, going back or after an error;
+            # a successful step just appends its filter line below the prompt
+            if needs_full_repaint:
+                self.terminal.clear_screen()
+                sys.stdout.write(_CONFIG_HEADER)
+                self.show_selected_filters(year_config, uf, municipality)
+                sys.stdout.write(_CONFIG_INTRO)
+            needs_full_repaint = True
             
             # Step 1: Get year if not set
             if year_config is None:
@@ -433,7 +564,9 @@ class MDSParcelasUI:
                 if year_config is None:  # invalid input or ESC
                     return None  # Return to main menu
                 self._temp_year_config = year_config  # Store for municipality input
-                continue  # Refresh screen with new filter
+                self._show_filter_added(year_config=year_config)
+                needs_full_repaint = False
+                continue
             
             # Step 2: Get UF if not set
             if uf is None:
@@ -441,7 +574,9 @@ class MDSParcelasUI:
                 if uf is None:  # ESC was pressed
                     year_config = None  # Go back to year selection
                     continue
-                continue  # Refresh screen with new filter
+                self._show_filter_added(uf=uf)
+                needs_full_repaint = False
+                continue
             
             # Step 3: Get municipality if not set
             if municipality is None:
@@ -449,17 +584,12 @@ class MDSParcelasUI:
                 if municipality is None:  # ESC was pressed
                     uf = None  # Go back to UF selection
                     continue
-                continue  # Refresh screen with new filter
+                self._show_filter_added(municipality=municipality)
+                needs_full_repaint = False
+                continue
             
             # All filters selected - show confirmation
-            print("✓ Todos os filtros configurados!")
-            print("")
-            print("1. Iniciar coleta")
-            print("2. Modificar ano")
-            print("3. Modificar estado")
-            print("4. Modificar município")
-            print("5. Voltar ao menu principal")
-            print("")
+            sys.stdout.write(_CONFIG_ACTIONS)
             
             choice = self._get_key_input("Digite sua opção (1-5): ")
             
@@ -506,22 +636,10 @@ class MDSParcelasUI:
             return self.get_multiple_years_input()
         
         # Try to parse as single year
-        try:
-            year = int(year_str)
-            
-            # Validate year (must be >= 2006)
-            current_year = datetime.now().year
-            if year < 2006:
-                self.terminal.show_error("Ano deve ser igual ou maior que 2006.")
-                return None
-            elif year > current_year:
-                self.terminal.show_error(f"Ano deve ser menor ou igual a {current_year}.")
-                return None
-            else:
-                return {'type': 'single', 'year': year}
-        except ValueError:
-            self.terminal.show_error("Entrada invalida. Digite um numero ou opcao valida.")
-            return None
+        year_config, error = parse_single(year_str, _MIN_YEAR, self._max_year)
+        if error:
+            self.terminal.show_error(error)
+        return year_config
     
     def get_year_range_input(self) -> Optional[Dict[str, Any]]:
         """Get year range input from user."""
@@ -533,10 +651,9 @@ class MDSParcelasUI:
         if start_year_str == self.ESC_PRESSED:
             return None
         
-        try:
-            start_year = int(start_year_str)
-        except ValueError:
-            self.terminal.show_error("Ano de início inválido.")
+        start_year, error = parse_year(start_year_str, _MIN_YEAR, self._max_year, "Ano de início")
+        if error:
+            self.terminal.show_error(error)
             return None
         
         # Get end year  
@@ -544,29 +661,18 @@ class MDSParcelasUI:
         if end_year_str == self.ESC_PRESSED:
             return None
         
-        try:
-            end_year = int(end_year_str)
-        except ValueError:
-            self.terminal.show_error("Ano de fim inválido.")
+        end_year, error = parse_year(end_year_str, _MIN_YEAR, self._max_year, "Ano de fim")
+        if error:
+            self.terminal.show_error(error)
             return None
         
-        # Validate range
-        current_year = datetime.now().year
-        
-        if start_year < 2006:
-            self.terminal.show_error("Ano de início deve ser igual ou maior que 2006.")
-            return None
-            
-        if end_year > current_year:
-            self.terminal.show_error(f"Ano de fim deve ser menor ou igual a {current_year}.")
-            return None
-            
-        if start_year > end_year:
-            self.terminal.show_error("Ano de início deve ser menor ou igual ao ano de fim.")
+        year_config, error = parse_range(start_year, end_year)
+        if error:
+            self.terminal.show_error(error)
             return None
         
         print(f"   Período configurado: {start_year} até {end_year} ({end_year - start_year + 1} anos)")
-        return {'type': 'range', 'start_year': start_year, 'end_year': end_year}
+        return year_config
     
     def get_multiple_years_input(self) -> Optional[Dict[str, Any]]:
         """Get multiple years input from user."""
@@ -577,37 +683,13 @@ class MDSParcelasUI:
         if years_str == self.ESC_PRESSED:
             return None
         
-        try:
-            # Parse comma-separated years
-            year_strings = [y.strip() for y in years_str.split(',')]
-            years = []
-            
-            for year_str in year_strings:
-                year = int(year_str)
-                
-                # Validate each year
-                if year < 2006:
-                    self.terminal.show_error(f"Ano {year} deve ser igual ou maior que 2006.")
-                    return None
-                elif year > datetime.now().year:
-                    self.terminal.show_error(f"Ano {year} deve ser menor ou igual a {datetime.now().year}.")
-                    return None
-                    
-                years.append(year)
-            
-            if not years:
-                self.terminal.show_error("Pelo menos um ano válido deve ser informado.")
-                return None
-            
-            # Remove duplicates and sort
-            years = sorted(list(set(years)))
-            
-            print(f"   Anos configurados: {', '.join(map(str, years))} ({len(years)} anos)")
-            return {'type': 'multiple', 'years': years}
-            
-        except ValueError:
-            self.terminal.show_error("Formato inválido. Use números separados por vírgula (ex: 2020, 2022, 2024).")
+        year_config, error = parse_multiple(years_str, _MIN_YEAR, self._max_year)
+        if error:
+            self.terminal.show_error(error)
             return None
+        
+        print(f"   Anos configurados: {year_config['years_str']} ({len(year_config['years'])} anos)")
+        return year_config
     
     def get_uf_input(self, prompt: str) -> Optional[str]:
         """Get and validate UF (state) input."""
@@ -620,19 +702,19 @@ class MDSParcelasUI:
         if uf_str == self.ESC_PRESSED:
             return None  # Signal to go back
         
-        uf = uf_str.upper().strip()
+        # Common case: a valid UF in any casing resolves with a single lookup
+        uf_str = uf_str.strip()
+        uf = self._UF_NORMALIZE.get(uf_str)
+        if uf is not None:
+            return uf
         
-        if len(uf) != 2:
+        if len(uf_str) != 2:
             self.terminal.show_error("UF deve ter exatamente 2 caracteres.")
-            return None
-        
-        if uf not in self.valid_states:
-            self.terminal.show_error(f"UF '{uf}' não é válida. Estados disponíveis: {', '.join(self.valid_states)}")
-            return None
-        
-        return uf
+        else:
+            self.terminal.show_error(f"UF '{uf_str.upper()}' não é válida. Estados disponíveis: {self.VALID_STATES_DISPLAY}")
+        return None
     
-    def get_municipality_input(self, prompt: str, uf: str) -> Optional[str]:
+    def get_municipality_input(self, prompt: str, uf: str) -> Optional[Union[str, AllMunicipalities]]:
         """Get municipality input with AI auto-correction."""
         while True:  # Loop until valid input or ESC
             print(prompt)
@@ -648,12 +730,13 @@ class MDSParcelasUI:
             municipality = municipality_str.strip()
             
             if not municipality:
-                self.terminal.show_error("Nome do município não pode ser vazio.")
+                self.terminal.show_inline_error("Nome do município não pode ser vazio.")
+                print("")
                 continue  # Ask again
             
             # Special case for "all municipalities"
             if municipality.upper() in ['TODOS', 'ALL', 'TODAS']:
-                return f"ALL_{uf}"
+                return AllMunicipalities(uf)
             
             # Use AI to correct municipality name
             try:
@@ -661,9 +744,8 @@ class MDSParcelasUI:
                 corrected_name = corrector.correct_municipality_name(municipality, uf)
                 
                 if corrected_name == "erro4040":
-                    self.terminal.show_error(f"Município '{municipality}' não existe no estado {uf}. Por favor, digite novamente.")
-                    input("Pressione Enter para continuar...")
-                    # Don't clear screen here, just continue the loop
+                    self.terminal.show_inline_error(f"Município '{municipality}' não existe no estado {uf}. Por favor, digite novamente.")
+                    # Don't clear screen here, just re-prompt right away
                     print("")
                     continue  # Ask again
                 
@@ -691,13 +773,17 @@ class MDSParcelasUI:
         progress = InteractiveProgressDisplay(self.terminal, config)
         
         try:
-            # Start logging session
-            logger.start_session(f"{config['site']}_scraping")
+            # Start logging session; a retry of the same config appends to the previous one
+            session_key = (config['site'], _year_key(config['year_config']), config['uf'], config['municipality'])
+            if self._last_session is not None and self._last_session[0] == session_key:
+                logger.resume_session(self._last_session[1])
+            else:
+                self._last_session = (session_key, logger.start_session(f"{config['site']}_scraping"))
             set_context(site=config['site'])
             
             # Enable silent mode to prevent console pollution
             logger.enable_silent_mode()
-            logger.info(f"Iniciando scraping MDS Parcelas: {config}")
+            logger.info("Iniciando scraping MDS Parcelas: %r", config)
             
             # Start interactive progress display
             progress.start()
@@ -706,11 +792,10 @@ class MDSParcelasUI:
             progress.show_status("Conectando ao site MDS", "Inicializando navegador")
             
             # Import and create scraper
-            from src.modules.sites.mds_parcelas import MDSParcelasScraper
-            scraper = MDSParcelasScraper()
+            scraper = self._get_scraper_cls()()
             
-            # Execute scraping with progress updates
-            result = self._execute_scraping_with_callbacks(scraper, config, progress)
+            # Execute scraping on a worker thread so cancel keys stay responsive
+            result = self._run_scraping_in_background(scraper, config, progress)
             
             logger.info(f"Scraping finalizado: {result.get('success', False)}")
             
@@ -727,6 +812,14 @@ class MDSParcelasUI:
             else:
                 self.show_error_screen(result)
                 
+        except KeyboardInterrupt:
+            # Forced stop: restore the console before the interrupt reaches the caller
+            progress.stop()
+            logger.disable_silent_mode()
+            logger.warning("Scraping interrompido pelo usuário")
+            logger.end_session()
+            raise
+        
         except Exception as e:
             # Capture real elapsed time before stopping progress display
             actual_elapsed_minutes = progress.get_elapsed_time()
@@ -745,13 +838,101 @@ class MDSParcelasUI:
             }
             self.show_error_screen(error_result)
     
+    def _run_scraping_in_background(self, scraper, config: Dict[str, Any], progress: InteractiveProgressDisplay) -> Dict[str, Any]:
+        """Run the scraper on a worker thread while the main thread polls for Q/ESC/Ctrl+C."""
+        results = queue.Queue(maxsize=1)
+        
+        def work():
+            try:
+                results.put((self._execute_scraping_with_callbacks(scraper, config, progress), None))
+            except Exception as e:
+                results.put((None, e))
+        
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        
+        # poll_key is None when there is no terminal to read keys from; Ctrl+C still cancels
+        poll_key = self._start_cancel_key_polling()
+        cancel_requested = False
+        try:
+            # Wait on the result queue: an interrupted Thread.join can report a live thread as finished
+            while True:
+                try:
+                    result, error = results.get(timeout=0.2)
+                    break
+                except queue.Empty:
+                    if not cancel_requested and poll_key is not None and poll_key():
+                        self._request_cancel(scraper, progress)
+                        cancel_requested = True
+                except KeyboardInterrupt:
+                    if cancel_requested:
+                        # Second Ctrl+C: give the scraper a bounded chance to close the browser
+                        worker.join(_CANCEL_JOIN_TIMEOUT)
+                        raise
+                    self._request_cancel(scraper, progress)
+                    cancel_requested = True
+        finally:
+            self._stop_cancel_key_polling()
+        
+        if error is not None:
+            raise error
+        return result
+    
+    def _request_cancel(self, scraper, progress: InteractiveProgressDisplay):
+        """Ask the scraper to stop; it finishes the current step before returning."""
+        logger.info("Cancelamento solicitado pelo usuário")
+        progress.show_status(progress.current_step, "cancelando, aguardando etapa atual terminar")
+        cancel = getattr(scraper, 'cancel', None)
+        if cancel is not None:
+            cancel()
+    
+    def _start_cancel_key_polling(self):
+        """Put stdin in cbreak mode and return a non-blocking Q/ESC check (None if unavailable)."""
+        self._saved_tty = None
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                
+                def poll_windows() -> bool:
+                    pressed = False
+                    while msvcrt.kbhit():
+                        pressed = msvcrt.getch() in (b'q', b'Q', b'\x1b') or pressed
+                    return pressed
+                return poll_windows
+            
+            import termios
+            import tty
+            
+            fd = sys.stdin.fileno()
+            selector = self._get_selector(fd)
+            self._saved_tty = (fd, termios.tcgetattr(fd))
+            tty.setcbreak(fd)  # Keys arrive unbuffered and are not echoed over the display
+            
+            def poll_unix() -> bool:
+                if not selector.select(0):
+                    return False
+                data = os.read(fd, 64)
+                # A lone ESC, not the start of an arrow-key sequence
+                return data == b'\x1b' or data[:1] in (b'q', b'Q')
+            return poll_unix
+        except Exception:
+            # No console/terminal (ImportError, termios.error, OSError): Ctrl+C still works
+            return None
+    
+    def _stop_cancel_key_polling(self):
+        """Restore the terminal mode changed by _start_cancel_key_polling."""
+        if self._saved_tty is not None:
+            import termios
+            fd, settings = self._saved_tty
+            termios.tcsetattr(fd, termios.TCSADRAIN, settings)
+            self._saved_tty = None
+    
     def _execute_scraping_with_callbacks(self, scraper, config: Dict[str, Any], progress: InteractiveProgressDisplay) -> Dict[str, Any]:
         """Execute scraping with progress callbacks."""
         completed_steps = ["Conectando ao site MDS"]
         
         # Authenticate
         progress.show_status("Fazendo autenticação", "Login no sistema", completed_steps)
-        time.sleep(0.5)  # Simulate authentication time
         completed_steps.append("Fazendo autenticação")
         
         # Apply filters
@@ -769,6 +950,9 @@ class MDSParcelasUI:
                 completed_steps_copy = completed_steps + ["Aplicando filtros", "Coletando dados", "Processando informações"]
                 progress.show_status("Salvando resultados", detail, completed_steps_copy)
         
+        # The scraper expects the municipality as a plain string ('ALL_<UF>' for all)
+        config = dict(config, municipality=str(config['municipality']))
+        
         # Execute the actual scraping
         try:
             # Pass the callback if the scraper supports it
@@ -895,9 +1079,9 @@ class MDSParcelasUI:
                 if sys.platform == "win32":
                     os.startfile(path)
                 elif sys.platform == "darwin":
-                    os.system(f"open '{path}'")
+                    subprocess.Popen(['open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 else:
-                    os.system(f"xdg-open '{path}'")
+                    subprocess.Popen(['xdg-open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             else:
                 print(f"Pasta nao encontrada: {path}")
         except Exception as e:
@@ -908,47 +1092,15 @@ class MDSParcelasUI:
     def show_error_logs(self):
         """Show error logs."""
         self.terminal.clear_screen()
-        print("========================================")
-        print("         LOGS DE ERRO")
-        print("========================================")
-        print("")
-        print("Logs detalhados salvos em: logs/")
-        print("")
-        print("Para análise técnica, verifique os arquivos de log.")
-        print("Os logs contêm informações detalhadas sobre:")
-        print("- Conexões com o site")
-        print("- Autenticação")
-        print("- Aplicação de filtros")
-        print("- Erros de parsing")
-        print("- Stack traces completos")
-        print("")
+        sys.stdout.write(_ERROR_LOGS_SCREEN)
+        sys.stdout.flush()
+        
         input("Pressione Enter para continuar...")
     
     def format_config_summary(self, config: Dict[str, Any]) -> str:
         """Format configuration summary for display."""
-        parts = []
-        
-        # Handle year configuration
-        year_config = config.get('year_config', {})
-        if year_config.get('type') == 'single':
-            parts.append(f"Ano: {year_config['year']}")
-        elif year_config.get('type') == 'range':
-            parts.append(f"Anos: {year_config['start_year']}-{year_config['end_year']}")
-        elif year_config.get('type') == 'multiple':
-            years_str = ', '.join(map(str, year_config['years']))
-            parts.append(f"Anos: {years_str}")
-        
-        # Handle UF
-        if 'uf' in config:
-            parts.append(f"UF: {config['uf']}")
-        
-        # Handle municipality
-        if 'municipality' in config:
-            municipality = config['municipality']
-            if municipality.startswith('ALL_'):
-                uf = municipality.split('_')[1]
-                parts.append(f"Municipio: Todos de {uf}")
-            else:
-                parts.append(f"Municipio: {municipality}")
-        
-        return ", ".join(parts)
\ No newline at end of file
+        return _config_summary(
+            _year_key(config.get('year_config')),
+            config.get('uf', _MISSING),
+            config.get('municipality', _MISSING),
+        )
\ No newline at end of file
@@ -8,13 +8,130 @@ de seleção de ano, mês e município.
 
 import sys
 import os
+import re
 import time
+import subprocess
 import threading
-from typing import Dict, List, Optional, Any
+import functools
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from src.utils.logger import logger, set_context
 from src.ai.municipality_corrector import get_municipality_corrector
+from src.ui._raw_keys import read_line
+from src.ui._year_parsing import parse_single, parse_year, parse_range, parse_multiple
+
+
+# Primeiro ano com dados disponíveis
+_MIN_YEAR = 2011
+
+# Config screen filters, in the order they are asked
+_CONFIG_FIELDS = ('year_config', 'month', 'uf', 'municipality')
+
+# Config screen "modify" options -> filters they reset
+_MODIFY_CHOICES = {
+    "2": ('year_config',),
+    "3": ('month',),
+    "4": ('uf', 'municipality'),
+    "5": ('municipality',),
+}
+
+# Multiple-months entry ("1,3,5-8,12"): whole-entry check, one match per item,
+# and a range with more than one '-' (for a specific error message)
+_MONTHS_SPEC_RE = re.compile(r'\s*\d+\s*(?:-\s*\d+\s*)?(?:,\s*\d+\s*(?:-\s*\d+\s*)?)*')
+_MONTH_TOKEN_RE = re.compile(r'(\d+)\s*(?:-\s*(\d+))?')
+_BAD_RANGE_RE = re.compile(r'-[^,]*-')
+
+# Month abbreviations shared by summaries, filters and progress messages
+_MONTH_ABBR = ('Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez')
+
+
+def _freeze(value):
+    """Hashable form of a year/month config dict (lists become tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in value.items()))
+    return value
+
+
+def _format_year_month(year_config, month, short_years: bool = False, short_months: bool = True) -> Tuple[str, ...]:
+    """Format the year and month filters; short_* lists only the first 3 items followed by '...'."""
+    return _format_year_month_cached(_freeze(year_config), _freeze(month), short_years, short_months)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_year_month_cached(year_key, month_key, short_years: bool, short_months: bool) -> Tuple[str, ...]:
+    """Cached body of _format_year_month, keyed on the frozen configs."""
+    parts = []
+    
+    year_config = dict(year_key) if year_key else {}
+    if year_config.get('type') == 'single':
+        parts.append(f"Ano: {year_config['year']}")
+    elif year_config.get('type') == 'range':
+        parts.append(f"Anos: {year_config['start_year']}-{year_config['end_year']}")
+    elif year_config.get('type') == 'multiple':
+        years = year_config['years']
+        years_str = ', '.join(map(str, years[:3] if short_years else years))
+        if short_years and len(years) > 3:
+            years_str += '...'
+        parts.append(f"Anos: {years_str}")
+    elif year_config.get('type') == 'all':
+        parts.append("Anos: Todos")
+    
+    if month_key:
+        if isinstance(month_key, tuple):
+            month = dict(month_key)
+            if month.get('type') == 'all':
+                parts.append("Mês: Todos")
+            elif month.get('type') == 'single':
+                parts.append(f"Mês: {_MONTH_ABBR[month['month']-1]}")
+            elif month.get('type') == 'multiple':
+                months = month['months']
+                months_str = ', '.join([_MONTH_ABBR[m-1] for m in (months[:3] if short_months else months)])
+                if short_months and len(months) > 3:
+                    months_str += '...'
+                parts.append(f"Meses: {months_str}")
+        else:
+            # Legacy support for integer month values
+            if month_key == 13:
+                parts.append("Mês: Todos")
+            elif 1 <= month_key <= 12:
+                parts.append(f"Mês: {_MONTH_ABBR[month_key-1]}")
+    
+    return tuple(parts)
+
+# Static error logs screen, written in a single call
+_ERROR_LOGS_SCREEN = (
+    "========================================\n"
+    "         LOGS DE ERRO\n"
+    "========================================\n"
+    "\n"
+    "Logs detalhados salvos em: logs/\n"
+    "\n"
+    "Para análise técnica, verifique os arquivos de log.\n"
+    "Os logs contêm informações detalhadas sobre:\n"
+    "- Conexões com o site\n"
+    "- Autenticação\n"
+    "- Aplicação de filtros\n"
+    "- Erros de parsing\n"
+    "- Stack traces completos\n"
+    "\n"
+)
+
+
+# Process steps shown by the progress display, in screen order
+_PROGRESS_STEPS = (
+    "Conectando ao site MDS",
+    "Fazendo autenticação",
+    "Aplicando filtros",
+    "Consultando saldo",
+    "Coletando dados",
+    "Processando informações",
+    "Salvando resultados",
+    "Finalizando"
+)
+# Step name -> offset from the first step row
+_STEP_LINE_INDEX = {name: i for i, name in enumerate(_PROGRESS_STEPS)}
 
 
 class InteractiveProgressDisplay:
@@ -26,37 +143,48 @@ class InteractiveProgressDisplay:
     def __init__(self, terminal_instance, config: Dict[str, Any]):
         self.terminal = terminal_instance
         self.config = config
-        self.start_time = datetime.now()
+        # (config object, summary) - the config does not change during a run
+        self._config_summary_cache = (config, self._build_config_summary())
+        self._start_monotonic = time.monotonic()  # Elapsed time is measured from here
         self.current_step = ""
         self.current_detail = ""
         self.steps_completed = []
+        # Immutable (step, detail, completed set) published by show_status; the update
+        # thread reads it without the lock (a single attribute load is atomic)
+        self._snapshot = ("", "", frozenset())
         
         # Animation system
         self.animation_frames = ["   ", ".  ", ".. ", "..."]
         self.animation_index = 0
         self.last_animation_update = time.time()
+        self._unchanged_count = 0  # Ticks with no animated step, used to back off the refresh rate
         
         # Threading control
         self.running = False
         self.update_thread = None
         self.lock = threading.Lock()
+        self._stop_event = threading.Event()  # Wakes the update loop on stop()
         
         # Display state
-        self.last_timer_line = ""
+        self._last_tenths = -1  # Elapsed tenths of a minute currently on screen
         self.timer_line_number = 7
         self.steps_start_line = 10
-        self.first_render = False
+        self.first_render = False  # Static frame drawn; later updates use cursor addressing
+        self._out = sys.stdout  # Every region is written with _emit and flushed once with _flush
+        self._step_lines = [""] * len(_PROGRESS_STEPS)  # Step rows currently on screen
         
     def start(self):
         """Start the real-time update thread."""
         if not self.running:
             self.running = True
+            self._stop_event.clear()
             self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
             self.update_thread.start()
     
     def stop(self):
         """Stop the real-time update thread."""
         self.running = False
+        self._stop_event.set()
         if self.update_thread:
             self.update_thread.join(timeout=1)
     
@@ -67,17 +195,57 @@ class InteractiveProgressDisplay:
             self.current_detail = detail
             if completed_steps:
                 self.steps_completed = completed_steps
+            self._snapshot = (step, detail, frozenset(self.steps_completed))
+            self._unchanged_count = 0  # New status: back to the fast refresh rate
+            
+            # The static frame is drawn once; afterwards only changed step rows are rewritten
+            if self.first_render:
+                self._render_changed_steps()
+                return
         
-        # Full render only on step changes
         self._full_render()
     
+    def _emit(self, text: str):
+        """Write a complete ANSI region without flushing."""
+        self._out.write(text)
+    
+    def _flush(self):
+        """Flush once at the end of a region."""
+        self._out.flush()
+    
+    def _render_changed_steps(self):
+        """Rewrite, in one write, every step row whose text changed (caller holds the lock)."""
+        out = []
+        for index, step_name in enumerate(_PROGRESS_STEPS):
+            line = self._step_line(step_name)
+            if line != self._step_lines[index]:
+                out.append(f"\033[{self.steps_start_line + index};1H\033[K{line}")
+                self._step_lines[index] = line
+        if out:
+            out.append("\033[20;1H")
+            self._emit("".join(out))
+            self._flush()
+    
+    def _step_line(self, step_name: str, snapshot: tuple = None) -> str:
+        """Build the display line for a step from a status snapshot (default: the current one)."""
+        current_step, current_detail, steps_completed = snapshot or self._snapshot
+        if step_name in steps_completed:
+            return f"✓ {step_name}"
+        if step_name == current_step:
+            animation = self.animation_frames[self.animation_index]
+            step_line = f"⋯ {step_name}{animation}"
+            if current_detail:
+                step_line += f" ({current_detail})"
+            return step_line
+        return f"  {step_name}"
+    
     def get_elapsed_time(self) -> float:
         """Get elapsed time in minutes since start."""
-        elapsed = datetime.now() - self.start_time
-        return elapsed.total_seconds() / 60
+        return (time.monotonic() - self._start_monotonic) / 60.0
     
     def _update_loop(self):
         """Background thread for real-time updates."""
+        animating = False
         while self.running:
             # Update timer every second
             self._update_timer()
@@ -85,167 +253,120 @@ class InteractiveProgressDisplay:
             # Update animation every 0.5 seconds
             current_time = time.time()
             if current_time - self.last_animation_update >= 0.5:
-                self._update_animation()
+                animating = self._update_animation()
                 self.last_animation_update = current_time
             
-            time.sleep(0.5)
+            # An active step animates on every 0.5s tick; with none active only the timer
+            # (every 6s) changes, so back off gradually up to 2s
+            if animating:
+                self._unchanged_count = 0
+            else:
+                self._unchanged_count += 1
+            delay = min(2.0, 0.5 * (1 + self._unchanged_count * 0.25))
+            
+            # Sleep until the next tick, returning at once if stop() is called
+            if self._stop_event.wait(delay):
+                break
     
     def _update_timer(self):
-        """Update only the timer line."""
+        """Update only the timer line, when the displayed value changes."""
         if not self.first_render:
             return
-            
+        
+        # The display only changes every 0.1 minute (6s): bail out before locking/formatting
+        tenths = self._elapsed_tenths()
+        if tenths == self._last_tenths:
+            return
+        
+        new_timer_line = f"Tempo decorrido: {tenths / 10:.1f} minutos"
+        
+        # The cursor is shared with the step row writers: move, rewrite and park under the lock
         with self.lock:
-            elapsed = datetime.now() - self.start_time
-            total_minutes = elapsed.total_seconds() / 60
-            new_timer_line = f"Tempo decorrido: {total_minutes:.1f} minutos"
-            
-            if new_timer_line != self.last_timer_line:
-                # Move cursor to timer line and update
-                print(f"\033[{self.timer_line_number};1H\033[K{new_timer_line}", end='', flush=True)
-                # Move cursor to bottom to avoid interference
-                print(f"\033[20;1H", end='', flush=True)
-                self.last_timer_line = new_timer_line
+            self._emit(f"\033[{self.timer_line_number};1H\033[K{new_timer_line}\033[20;1H")
+            self._flush()
+        self._last_tenths = tenths
     
-    def _update_animation(self):
-        """Update loading animations for active steps."""
-        with self.lock:
-            self.animation_index = (self.animation_index + 1) % len(self.animation_frames)
-            
-            # Update the current step line with animation
-            if self.current_step:
-                self._update_current_step_line()
+    def _elapsed_tenths(self) -> int:
+        """Elapsed time in tenths of a minute, rounded like the '.1f' display."""
+        return int((time.monotonic() - self._start_monotonic) / 6.0 + 0.5)
+    
+    def _update_animation(self) -> bool:
+        """Animate the active step (update thread only); False when nothing is animating."""
+        snapshot = self._snapshot
+        step, _, steps_completed = snapshot
+        if step not in _STEP_LINE_INDEX or step in steps_completed:
+            return False
+        
+        self.animation_index = (self.animation_index + 1) % len(self.animation_frames)
+        
+        # Update the current step line with animation
+        self._update_current_step_line(snapshot)
+        return True
     
-    def _update_current_step_line(self):
-        """Update only the line with the current active step."""
+    def _update_current_step_line(self, snapshot: tuple):
+        """Update only the line with the current active step (row write under the lock)."""
         if not self.first_render:
             return
             
-        all_steps = [
-            "Conectando ao site MDS",
-            "Fazendo autenticação",
-            "Aplicando filtros",
-            "Consultando saldo",
-            "Coletando dados",
-            "Processando informações",
-            "Salvando resultados",
-            "Finalizando"
-        ]
-        
-        if self.current_step in all_steps:
-            step_index = all_steps.index(self.current_step)
+        step_index = _STEP_LINE_INDEX.get(snapshot[0])
+        if step_index is not None:
             line_number = self.steps_start_line + step_index
-            
-            # Build the step line with animation
-            animation = self.animation_frames[self.animation_index]
-            step_line = f"⋯ {self.current_step}{animation}"
-            
-            # Add detail if available
-            if self.current_detail:
-                step_line += f" ({self.current_detail})"
-            
-            # Move cursor to step line and update
-            print(f"\033[{line_number};1H\033[K{step_line}", end='', flush=True)
-            # Move cursor to bottom to avoid interference
-            print(f"\033[20;1H", end='', flush=True)
+            step_line = self._step_line(snapshot[0], snapshot)
+            with self.lock:
+                if self._snapshot is not snapshot:
+                    return  # show_status published a newer state and redrew the rows
+                self._step_lines[step_index] = step_line
+                
+                # Move to the step line, rewrite it and park the cursor at the bottom in one write
+                self._emit(f"\033[{line_number};1H\033[K{step_line}\033[20;1H")
+                self._flush()
     
     def _full_render(self):
-        """Render the complete interface."""
-        self.terminal.clear_screen()
-        print("========================================")
-        print("         EM PROCESSAMENTO")
-        print("========================================")
-        print("")
+        """Render the complete interface as one buffered write (first status only)."""
+        clear = self.terminal.clear_sequence()
+        if not clear:
+            self.terminal.clear_screen()
+        
+        buf = [clear]
+        append = buf.append
+        append("========================================\n")
+        append("         EM PROCESSAMENTO\n")
+        append("========================================\n\n")
         
         # Show configuration summary
-        config_summary = self._format_config()
-        print(f"Configuração: {config_summary}")
-        print("")
+        append(f"Configuração: {self._format_config()}\n\n")
         
         # Show elapsed time (will be updated by thread)
-        elapsed = datetime.now() - self.start_time
-        total_minutes = elapsed.total_seconds() / 60
-        self.last_timer_line = f"Tempo decorrido: {total_minutes:.1f} minutos"
-        print(self.last_timer_line)
-        print("")
+        self._last_tenths = self._elapsed_tenths()
+        append(f"Tempo decorrido: {self._last_tenths / 10:.1f} minutos\n\n")
         
         # Show process steps
-        print("Etapas do processo:")
-        
-        all_steps = [
-            "Conectando ao site MDS",
-            "Fazendo autenticação",
-            "Aplicando filtros",
-            "Consultando saldo",
-            "Coletando dados",
-            "Processando informações",
-            "Salvando resultados",
-            "Finalizando"
-        ]
-        
-        for step_name in all_steps:
-            if step_name in self.steps_completed:
-                print(f"✓ {step_name}")
-            elif step_name == self.current_step:
-                # Initial render with animation
-                animation = self.animation_frames[self.animation_index]
-                step_line = f"⋯ {step_name}{animation}"
-                if self.current_detail:
-                    step_line += f" ({self.current_detail})"
-                print(step_line)
-            else:
-                print(f"  {step_name}")
+        append("Etapas do processo:\n")
+        for index, step_name in enumerate(_PROGRESS_STEPS):
+            self._step_lines[index] = self._step_line(step_name)
+            append(f"{self._step_lines[index]}\n")
         
-        print("")
-        print("Pressione Ctrl+C para cancelar")
+        append("\nPressione Ctrl+C para cancelar\n")
         
         # Mark first render as complete and position cursor safely
         self.first_render = True
-        print(f"\033[20;1H", end='', flush=True)
+        append("\033[20;1H")
+        self._emit("".join(buf))
+        self._flush()
     
     def _format_config(self) -> str:
-        """Format configuration for display."""
-        parts = []
-        
-        # Handle year configuration
-        year_config = self.config.get('year_config', {})
-        if year_config.get('type') == 'single':
-            parts.append(f"Ano: {year_config['year']}")
-        elif year_config.get('type') == 'range':
-            parts.append(f"Anos: {year_config['start_year']}-{year_config['end_year']}")
-        elif year_config.get('type') == 'multiple':
-            years_str = ', '.join(map(str, year_config['years'][:3]))
-            if len(year_config['years']) > 3:
-                years_str += '...'
-            parts.append(f"Anos: {years_str}")
-        elif year_config.get('type') == 'all':
-            parts.append("Anos: Todos")
-        
-        # Handle month
-        if 'month' in self.config:
-            month = self.config['month']
-            if isinstance(month, dict):
-                if month.get('type') == 'all':
-                    parts.append("Mês: Todos")
-                elif month.get('type') == 'single':
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    parts.append(f"Mês: {month_names[month['month']-1]}")
-                elif month.get('type') == 'multiple':
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    months_str = ', '.join([month_names[m-1] for m in month['months'][:3]])
-                    if len(month['months']) > 3:
-                        months_str += '...'
-                    parts.append(f"Meses: {months_str}")
-            else:
-                # Legacy support for integer month values
-                if month == 13:
-                    parts.append("Mês: Todos")
-                elif 1 <= month <= 12:
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    parts.append(f"Mês: {month_names[month-1]}")
+        """Format configuration for display, rebuilding only if self.config was replaced."""
+        cached_config, summary = self._config_summary_cache
+        if cached_config is not self.config:
+            summary = self._build_config_summary()
+            self._config_summary_cache = (self.config, summary)
+        return summary
+    
+    def _build_config_summary(self) -> str:
+        """Build the configuration summary line."""
+        # Year and month, lists shortened to 3 items
+        parts = list(_format_year_month(self.config.get('year_config'), self.config.get('month'),
+                                        short_years=True))
         
         # Handle UF
         if 'uf' in self.config:
@@ -255,7 +376,7 @@ class InteractiveProgressDisplay:
         if 'municipality' in self.config:
             municipality = self.config['municipality']
             if municipality.startswith('ALL_'):
-                uf = municipality.split('_')[1]
+                uf = municipality[4:]  # Strip the 'ALL_' prefix
                 parts.append(f"Município: Todos de {uf}")
             else:
                 parts.append(f"Município: {municipality}")
@@ -266,6 +387,33 @@ class MDSSaldoUI:
     """
     Interface do usuário específica para MDS Saldo Detalhado por Conta.
     """
+
+    # Estados brasileiros válidos (ordem de exibição)
+    VALID_STATES_ORDERED = (
+        'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA',
+        'MT', 'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI', 'RJ', 'RN',
+        'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
+    )
+    VALID_STATES_DISPLAY = ', '.join(VALID_STATES_ORDERED)
+
+    # Every casing of every UF ('MG', 'mg', 'Mg', 'mG') mapped to the canonical sigla
+    _UF_NORMALIZE = {
+        a + b: uf
+        for uf in VALID_STATES_ORDERED
+        for a in (uf[0], uf[0].lower())
+        for b in (uf[1], uf[1].lower())
+    }
+
+    # Scraper class, imported lazily on first run and reused afterwards
+    _scraper_cls = None
+    
+    @classmethod
+    def _get_scraper_cls(cls):
+        """Import the scraper class once and cache it on the class."""
+        if cls._scraper_cls is None:
+            from src.modules.sites.mds_saldo import MDSSaldoScraper
+            cls._scraper_cls = MDSSaldoScraper
+        return cls._scraper_cls
     
     def __init__(self, terminal_instance):
         self.terminal = terminal_instance
@@ -279,12 +427,11 @@ class MDSSaldoUI:
             'handler': 'mds_saldo'
         }
         
-        # Estados brasileiros válidos
-        self.valid_states = [
-            'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA',
-            'MT', 'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI', 'RJ', 'RN',
-            'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
-        ]
+        # Latest selectable year, resolved once per UI instead of per prompt
+        self._max_year = datetime.now().year
+        
+        # Bytes read past Enter (pasted answers), consumed by the next prompt
+        self._pending_keys = bytearray()
     
     def _get_key_input(self, prompt: str) -> str:
         """Get user input with ESC detection support."""
@@ -308,58 +455,8 @@ class MDSSaldoUI:
     def _get_key_unix(self) -> str:
         """Unix/Linux/macOS key detection."""
         try:
-            # Import Unix-specific modules only when needed
-            import termios
-            import tty
-            import select
-            
-            old_settings = termios.tcgetattr(sys.stdin)
-            try:
-                tty.setraw(sys.stdin.fileno())
-                
-                # Read input character by character
-                chars = []
-                while True:
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        char = sys.stdin.read(1)
-                        
-                        # ESC key (ASCII 27)
-                        if ord(char) == 27:
-                            # Check if it's a real ESC or part of escape sequence
-                            if select.select([sys.stdin], [], [], 0.1)[0]:
-                                # It's an escape sequence, consume it
-                                next_char = sys.stdin.read(1)
-                                if next_char == '[':
-                                    # Arrow keys, function keys, etc.
-                                    sys.stdin.read(1)  # consume the rest
-                                    continue
-                            else:
-                                # Real ESC key
-                                return self.ESC_PRESSED
-                        
-                        # Enter key
-                        elif ord(char) in [10, 13]:  # \n or \r
-                            break
-                        
-                        # Backspace
-                        elif ord(char) == 127:
-                            if chars:
-                                chars.pop()
-                                sys.stdout.write('\b \b')
-                                sys.stdout.flush()
-                        
-                        # Regular character
-                        elif ord(char) >= 32:  # Printable characters
-                            chars.append(char)
-                            sys.stdout.write(char)
-                            sys.stdout.flush()
-                
-                print()  # New line after input
-                return ''.join(chars).strip()
-                
-            finally:
-                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-        
+            sys.stdout.flush()  # Prompt must reach the screen before raw echo
+            line = read_line(sys.stdin.fileno(), sys.stdout.fileno(), self._pending_keys)
         except (ImportError, ModuleNotFoundError, OSError):
             # Fallback: aceitar tanto ESC físico quanto 'esc' digitado
             print("(Digite 'esc' para voltar)")
@@ -367,6 +464,12 @@ class MDSSaldoUI:
             if user_input == 'esc':
                 return self.ESC_PRESSED
             return user_input
+        
+        if line is None:
+            return self.ESC_PRESSED
+        
+        print()  # New line after input
+        return line
     
     def _get_key_windows(self) -> str:
         """Windows key detection - fallback to regular input with ESC simulation."""
@@ -390,9 +493,9 @@ class MDSSaldoUI:
                     elif ord(char) == 8:
                         if chars:
                             chars.pop()
-                            msvcrt.putch(b'\b')
-                            msvcrt.putch(b' ')
-                            msvcrt.putch(b'\b')
+                            # Erase the last character with one console write
+                            sys.stdout.write('\b \b')
+                            sys.stdout.flush()
                     
                     # Regular character
                     elif ord(char) >= 32:
@@ -412,106 +515,77 @@ class MDSSaldoUI:
     
     def show_selected_filters(self, year_config=None, month=None, uf=None, municipality=None):
         """Mostra os filtros já selecionados no topo da tela."""
-        filters = []
-        
-        if year_config:
-            if year_config.get('type') == 'single':
-                filters.append(f"Ano: {year_config['year']}")
-            elif year_config.get('type') == 'range':
-                filters.append(f"Anos: {year_config['start_year']}-{year_config['end_year']}")
-            elif year_config.get('type') == 'multiple':
-                years_str = ', '.join(map(str, year_config['years']))
-                filters.append(f"Anos: {years_str}")
-            elif year_config.get('type') == 'all':
-                filters.append("Anos: Todos")
-        
-        if month:
-            if isinstance(month, dict):
-                if month.get('type') == 'all':
-                    filters.append("Mês: Todos")
-                elif month.get('type') == 'single':
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    filters.append(f"Mês: {month_names[month['month']-1]}")
-                elif month.get('type') == 'multiple':
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    months_str = ', '.join([month_names[m-1] for m in month['months'][:3]])
-                    if len(month['months']) > 3:
-                        months_str += '...'
-                    filters.append(f"Meses: {months_str}")
-            else:
-                # Legacy support for integer month values
-                if month == 13:
-                    filters.append("Mês: Todos")
-                elif 1 <= month <= 12:
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    filters.append(f"Mês: {month_names[month-1]}")
+        filters = self._filter_parts(year_config, month, uf, municipality)
+        
+        if filters:
+            print("Filtros selecionados: " + " | ".join(filters))
+            print("")
+    
+    def _show_filter_added(self, year_config=None, month=None, uf=None, municipality=None):
+        """Print just the filter that was selected, without repainting the screen."""
+        print("✓ " + " | ".join(self._filter_parts(year_config, month, uf, municipality)))
+        print("")
+    
+    def _filter_parts(self, year_config, month, uf, municipality) -> List[str]:
+        """Format each selected filter as a 'Label: value' string."""
+        filters = list(_format_year_month(year_config, month))
         
         if uf:
             filters.append(f"Estado: {uf}")
         
         if municipality:
             if municipality.startswith('ALL_'):
-                state = municipality.split('_')[1]
+                state = municipality[4:]  # Strip the 'ALL_' prefix
                 filters.append(f"Município: Todos de {state}")
             else:
                 filters.append(f"Município: {municipality}")
         
-        if filters:
-            print("Filtros selecionados: " + " | ".join(filters))
-            print("")
+        return filters
     
     def show_config_screen(self) -> Optional[Dict[str, Any]]:
         """Show MDS Saldo Detalhado configuration screen."""
-        year_config = None
-        month = None
-        uf = None
-        municipality = None
+        selected = dict.fromkeys(_CONFIG_FIELDS)
+        
+        # (filter, input call, filter cleared when ESC goes back; None = main menu),
+        # asked in order for the first filter still missing
+        steps = (
+            ('year_config', lambda: self.get_year_input("1. Ano (obrigatório, >= 2011):"), None),
+            ('month', lambda: self.get_month_input("2. Mês (obrigatório):"), 'year_config'),
+            ('uf', lambda: self.get_uf_input("3. Estado (UF):"), 'month'),
+            ('municipality', lambda: self.get_municipality_input("4. Município:", selected['uf']), 'uf'),
+        )
+        
+        needs_full_repaint = True
         
         while True:
-            self.terminal.clear_screen()
-            print("========================================")
-            print("    MDS - SALDO DETALHADO POR CONTA")
-            print("========================================")
-            print("")
-            self.show_selected_filters(year_config, month, uf, municipality)
-            print("Site: aplicacoes.mds.gov.br/suaswebcons")
-            print("")
-            print("Configure os filtros para consulta:")
-            print("")
+            # Full repaint only when entering, going back or after an error;
+            # a successful step just appends its filter line below the prompt
+            if needs_full_repaint:
+                self.terminal.clear_screen()
+                print("========================================")
+                print("    MDS - SALDO DETALHADO POR CONTA")
+                print("========================================")
+                print("")
+                self.show_selected_filters(**selected)
+                print("Site: aplicacoes.mds.gov.br/suaswebcons")
+                print("")
+                print("Configure os filtros para consulta:")
+                print("")
+            needs_full_repaint = True
             
-            # Step 1: Get year if not set
-            if year_config is None:
-                year_config = self.get_year_input("1. Ano (obrigatório, >= 2011):")
-                if year_config is None:  # invalid input or ESC
-                    return None  # Return to main menu
-                continue  # Refresh screen with new filter
-            
-            # Step 2: Get month if not set
-            if month is None:
-                month = self.get_month_input("2. Mês (obrigatório):")
-                if month is None:  # ESC was pressed
-                    year_config = None  # Go back to year selection
+            missing = next((step for step in steps if selected[step[0]] is None), None)
+            if missing is not None:
+                field, ask, back_field = missing
+                value = ask()
+                if value is None:  # invalid input or ESC
+                    if back_field is None:
+                        return None  # Return to main menu
+                    selected[back_field] = None  # Go back to the previous filter
                     continue
-                continue  # Refresh screen with new filter
-            
-            # Step 3: Get UF if not set
-            if uf is None:
-                uf = self.get_uf_input("3. Estado (UF):")
-                if uf is None:  # ESC was pressed
-                    month = None  # Go back to month selection
-                    continue
-                continue  # Refresh screen with new filter
-            
-            # Step 4: Get municipality if not set
-            if municipality is None:
-                municipality = self.get_municipality_input("4. Município:", uf)
-                if municipality is None:  # ESC was pressed
-                    uf = None  # Go back to UF selection
-                    continue
-                continue  # Refresh screen with new filter
+                selected[field] = value
+                self._show_filter_added(**{field: value})
+                needs_full_repaint = False
+                continue
             
             # All filters selected - show confirmation
             print("✓ Todos os filtros configurados!")
@@ -526,29 +600,22 @@ class MDSSaldoUI:
             
             choice = self._get_key_input("Digite sua opção (1-6): ")
             
-            if choice == self.ESC_PRESSED:
+            if choice == self.ESC_PRESSED or choice == "6":
                 return None  # Return to main menu
             elif choice == "1":
                 config = {
                     'site': 'mds_saldo',
-                    'year_config': year_config,
-                    'month': month,
-                    'uf': uf.upper(),
-                    'municipality': municipality,
+                    'year_config': selected['year_config'],
+                    'month': selected['month'],
+                    'uf': selected['uf'].upper(),
+                    'municipality': selected['municipality'],
                     'url': self.site_info['url']
                 }
                 return config
-            elif choice == "2":
-                year_config = None  # Reset year to modify
-            elif choice == "3":
-                month = None  # Reset month to modify
-            elif choice == "4":
-                uf = None  # Reset UF to modify
-                municipality = None  # Also reset municipality since it depends on UF
-            elif choice == "5":
-                municipality = None  # Reset municipality to modify
-            elif choice == "6":
-                return None
+            elif choice in _MODIFY_CHOICES:
+                # Reset the filter(s) to modify; changing the UF also resets the municipality
+                for field in _MODIFY_CHOICES[choice]:
+                    selected[field] = None
             else:
                 self.terminal.show_error("Opção inválida. Tente novamente.")
     
@@ -575,22 +642,10 @@ class MDSSaldoUI:
             return self.get_multiple_years_input()
         
         # Try to parse as single year
-        try:
-            year = int(year_str)
-            
-            # Validate year (must be >= 2011)
-            current_year = datetime.now().year
-            if year < 2011:
-                self.terminal.show_error("Ano deve ser igual ou maior que 2011.")
-                return None
-            elif year > current_year:
-                self.terminal.show_error(f"Ano deve ser menor ou igual a {current_year}.")
-                return None
-            else:
-                return {'type': 'single', 'year': year}
-        except ValueError:
-            self.terminal.show_error("Entrada invalida. Digite um numero ou opcao valida.")
-            return None
+        year_config, error = parse_single(year_str, _MIN_YEAR, self._max_year)
+        if error:
+            self.terminal.show_error(error)
+        return year_config
     
     def get_year_range_input(self) -> Optional[Dict[str, Any]]:
         """Get year range input from user."""
@@ -602,10 +657,9 @@ class MDSSaldoUI:
         if start_year_str == self.ESC_PRESSED:
             return None
         
-        try:
-            start_year = int(start_year_str)
-        except ValueError:
-            self.terminal.show_error("Ano de início inválido.")
+        start_year, error = parse_year(start_year_str, _MIN_YEAR, self._max_year, "Ano de início")
+        if error:
+            self.terminal.show_error(error)
             return None
         
         # Get end year  
@@ -613,29 +667,18 @@ class MDSSaldoUI:
         if end_year_str == self.ESC_PRESSED:
             return None
         
-        try:
-            end_year = int(end_year_str)
-        except ValueError:
-            self.terminal.show_error("Ano de fim inválido.")
+        end_year, error = parse_year(end_year_str, _MIN_YEAR, self._max_year, "Ano de fim")
+        if error:
+            self.terminal.show_error(error)
             return None
         
-        # Validate range
-        current_year = datetime.now().year
-        
-        if start_year < 2011:
-            self.terminal.show_error("Ano de início deve ser igual ou maior que 2011.")
-            return None
-            
-        if end_year > current_year:
-            self.terminal.show_error(f"Ano de fim deve ser menor ou igual a {current_year}.")
-            return None
-            
-        if start_year > end_year:
-            self.terminal.show_error("Ano de início deve ser menor ou igual ao ano de fim.")
+        year_config, error = parse_range(start_year, end_year)
+        if error:
+            self.terminal.show_error(error)
             return None
         
         print(f"   Período configurado: {start_year} até {end_year} ({end_year - start_year + 1} anos)")
-        return {'type': 'range', 'start_year': start_year, 'end_year': end_year}
+        return year_config
     
     def get_multiple_years_input(self) -> Optional[Dict[str, Any]]:
         """Get multiple years input from user."""
@@ -646,37 +689,13 @@ class MDSSaldoUI:
         if years_str == self.ESC_PRESSED:
             return None
         
-        try:
-            # Parse comma-separated years
-            year_strings = [y.strip() for y in years_str.split(',')]
-            years = []
-            
-            for year_str in year_strings:
-                year = int(year_str)
-                
-                # Validate each year
-                if year < 2011:
-                    self.terminal.show_error(f"Ano {year} deve ser igual ou maior que 2011.")
-                    return None
-                elif year > datetime.now().year:
-                    self.terminal.show_error(f"Ano {year} deve ser menor ou igual a {datetime.now().year}.")
-                    return None
-                    
-                years.append(year)
-            
-            if not years:
-                self.terminal.show_error("Pelo menos um ano válido deve ser informado.")
-                return None
-            
-            # Remove duplicates and sort
-            years = sorted(list(set(years)))
-            
-            print(f"   Anos configurados: {', '.join(map(str, years))} ({len(years)} anos)")
-            return {'type': 'multiple', 'years': years}
-            
-        except ValueError:
-            self.terminal.show_error("Formato inválido. Use números separados por vírgula (ex: 2020, 2022, 2024).")
+        year_config, error = parse_multiple(years_str, _MIN_YEAR, self._max_year)
+        if error:
+            self.terminal.show_error(error)
             return None
+        
+        print(f"   Anos configurados: {year_config['years_str']} ({len(year_config['years'])} anos)")
+        return year_config
 
     def get_month_input(self, prompt: str) -> Optional[Dict[str, Any]]:
         """Get and validate month input."""
@@ -726,59 +745,37 @@ class MDSSaldoUI:
         if months_str == self.ESC_PRESSED:
             return None
         
-        try:
-            months = set()
-            
-            # Split by comma first
-            parts = [part.strip() for part in months_str.split(',')]
-            
-            for part in parts:
-                if '-' in part:
-                    # Handle range (e.g., "1-6")
-                    range_parts = part.split('-')
-                    if len(range_parts) == 2:
-                        start = int(range_parts[0].strip())
-                        end = int(range_parts[1].strip())
-                        
-                        if start < 1 or start > 12 or end < 1 or end > 12:
-                            self.terminal.show_error("Meses devem estar entre 1 e 12.")
-                            return None
-                        
-                        if start > end:
-                            self.terminal.show_error("Mês inicial deve ser menor ou igual ao final no intervalo.")
-                            return None
-                        
-                        for month in range(start, end + 1):
-                            months.add(month)
-                    else:
-                        self.terminal.show_error("Formato de intervalo inválido. Use formato 'início-fim' (ex: 1-6).")
-                        return None
-                else:
-                    # Handle single month
-                    month = int(part)
-                    if month < 1 or month > 12:
-                        self.terminal.show_error("Meses devem estar entre 1 e 12.")
-                        return None
-                    months.add(month)
+        # The whole entry must be a comma-separated list of months or 'start-end' ranges
+        if not _MONTHS_SPEC_RE.fullmatch(months_str):
+            if _BAD_RANGE_RE.search(months_str):
+                self.terminal.show_error("Formato de intervalo inválido. Use formato 'início-fim' (ex: 1-6).")
+            else:
+                self.terminal.show_error("Formato inválido. Use números de 1-12, vírgulas e hífens (ex: 1,3,5-8,12).")
+            return None
+        
+        months = set()
+        for match in _MONTH_TOKEN_RE.finditer(months_str):
+            start = int(match.group(1))
+            end = int(match.group(2) or start)  # Single month: a one-month range
             
-            if not months:
-                self.terminal.show_error("Pelo menos um mês válido deve ser informado.")
+            if start < 1 or start > 12 or end < 1 or end > 12:
+                self.terminal.show_error("Meses devem estar entre 1 e 12.")
                 return None
             
-            # Convert to sorted list
-            months_list = sorted(list(months))
-            
-            # Display confirmation
-            month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                          'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            month_names_str = ', '.join([month_names[m-1] for m in months_list])
-            print(f"   Meses configurados: {month_names_str} ({len(months_list)} meses)")
-            
-            return {'type': 'multiple', 'months': months_list}
+            if start > end:
+                self.terminal.show_error("Mês inicial deve ser menor ou igual ao final no intervalo.")
+                return None
             
-        except ValueError:
-            self.terminal.show_error("Formato inválido. Use números de 1-12, vírgulas e hífens (ex: 1,3,5-8,12).")
-            return None
+            months.update(range(start, end + 1))
+        
+        # Convert to sorted list
+        months_list = sorted(months)
+        
+        # Display confirmation
+        month_names_str = ', '.join([_MONTH_ABBR[m-1] for m in months_list])
+        print(f"   Meses configurados: {month_names_str} ({len(months_list)} meses)")
+        
+        return {'type': 'multiple', 'months': months_list}
     
     def get_uf_input(self, prompt: str) -> Optional[str]:
         """Get and validate UF (state) input."""
@@ -791,17 +788,17 @@ class MDSSaldoUI:
         if uf_str == self.ESC_PRESSED:
             return None  # Signal to go back
         
-        uf = uf_str.upper().strip()
+        # Common case: a valid UF in any casing resolves with a single lookup
+        uf_str = uf_str.strip()
+        uf = self._UF_NORMALIZE.get(uf_str)
+        if uf is not None:
+            return uf
         
-        if len(uf) != 2:
+        if len(uf_str) != 2:
             self.terminal.show_error("UF deve ter exatamente 2 caracteres.")
-            return None
-        
-        if uf not in self.valid_states:
-            self.terminal.show_error(f"UF '{uf}' não é válida. Estados disponíveis: {', '.join(self.valid_states)}")
-            return None
-        
-        return uf
+        else:
+            self.terminal.show_error(f"UF '{uf_str.upper()}' não é válida. Estados disponíveis: {self.VALID_STATES_DISPLAY}")
+        return None
     
     def get_municipality_input(self, prompt: str, uf: str) -> Optional[str]:
         """Get municipality input with AI auto-correction."""
@@ -819,7 +816,8 @@ class MDSSaldoUI:
             municipality = municipality_str.strip()
             
             if not municipality:
-                self.terminal.show_error("Nome do município não pode ser vazio.")
+                self.terminal.show_inline_error("Nome do município não pode ser vazio.")
+                print("")
                 continue  # Ask again
             
             # Special case for "all municipalities"
@@ -832,9 +830,8 @@ class MDSSaldoUI:
                 corrected_name = corrector.correct_municipality_name(municipality, uf)
                 
                 if corrected_name == "erro4040":
-                    self.terminal.show_error(f"Município '{municipality}' não existe no estado {uf}. Por favor, digite novamente.")
-                    input("Pressione Enter para continuar...")
-                    # Don't clear screen here, just continue the loop
+                    self.terminal.show_inline_error(f"Município '{municipality}' não existe no estado {uf}. Por favor, digite novamente.")
+                    # Don't clear screen here, just re-prompt right away
                     print("")
                     continue  # Ask again
                 
@@ -877,8 +874,7 @@ class MDSSaldoUI:
             progress.show_status("Conectando ao site MDS", "Inicializando navegador")
             
             # Import and create scraper
-            from src.modules.sites.mds_saldo import MDSSaldoScraper
-            scraper = MDSSaldoScraper()
+            scraper = self._get_scraper_cls()()
             
             # Execute scraping with progress updates
             result = self._execute_scraping_with_callbacks(scraper, config, progress)
@@ -922,7 +918,6 @@ class MDSSaldoUI:
         
         # Authenticate
         progress.show_status("Fazendo autenticação", "Login no sistema", completed_steps)
-        time.sleep(0.5)  # Simulate authentication time
         completed_steps.append("Fazendo autenticação")
         
         # Apply filters
@@ -1092,9 +1087,9 @@ class MDSSaldoUI:
                 if sys.platform == "win32":
                     os.startfile(path)
                 elif sys.platform == "darwin":
-                    os.system(f"open '{path}'")
+                    subprocess.Popen(['open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 else:
-                    os.system(f"xdg-open '{path}'")
+                    subprocess.Popen(['xdg-open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             else:
                 print(f"Pasta nao encontrada: {path}")
         except Exception as e:
@@ -1105,61 +1100,16 @@ class MDSSaldoUI:
     def show_error_logs(self):
         """Show error logs."""
         self.terminal.clear_screen()
-        print("========================================")
-        print("         LOGS DE ERRO")
-        print("========================================")
-        print("")
-        print("Logs detalhados salvos em: logs/")
-        print("")
-        print("Para análise técnica, verifique os arquivos de log.")
-        print("Os logs contêm informações detalhadas sobre:")
-        print("- Conexões com o site")
-        print("- Autenticação")
-        print("- Aplicação de filtros")
-        print("- Erros de parsing")
-        print("- Stack traces completos")
-        print("")
+        sys.stdout.write(_ERROR_LOGS_SCREEN)
+        sys.stdout.flush()
+        
         input("Pressione Enter para continuar...")
     
     def format_config_summary(self, config: Dict[str, Any]) -> str:
         """Format configuration summary for display."""
-        parts = []
-        
-        # Handle year configuration
-        year_config = config.get('year_config', {})
-        if year_config.get('type') == 'single':
-            parts.append(f"Ano: {year_config['year']}")
-        elif year_config.get('type') == 'range':
-            parts.append(f"Anos: {year_config['start_year']}-{year_config['end_year']}")
-        elif year_config.get('type') == 'multiple':
-            years_str = ', '.join(map(str, year_config['years']))
-            parts.append(f"Anos: {years_str}")
-        elif year_config.get('type') == 'all':
-            parts.append("Anos: Todos")
-        
-        # Handle month
-        if 'month' in config:
-            month = config['month']
-            if isinstance(month, dict):
-                if month.get('type') == 'all':
-                    parts.append("Mês: Todos")
-                elif month.get('type') == 'single':
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    parts.append(f"Mês: {month_names[month['month']-1]}")
-                elif month.get('type') == 'multiple':
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    months_str = ', '.join([month_names[m-1] for m in month['months']])
-                    parts.append(f"Meses: {months_str}")
-            else:
-                # Legacy support for integer month values
-                if month == 13:
-                    parts.append("Mês: Todos")
-                elif 1 <= month <= 12:
-                    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    parts.append(f"Mês: {month_names[month-1]}")
+        # Year and month, listed in full
+        parts = list(_format_year_month(config.get('year_config'), config.get('month'),
+                                        short_months=False))
         
         # Handle UF
         if 'uf' in config:
@@ -1169,7 +1119,7 @@ class MDSSaldoUI:
         if 'municipality' in config:
             municipality = config['municipality']
             if municipality.startswith('ALL_'):
-                uf = municipality.split('_')[1]
+                uf = municipality[4:]  # Strip the 'ALL_' prefix
                 parts.append(f"Municipio: Todos de {uf}")
             else:
                 parts.append(f"Municipio: {municipality}")
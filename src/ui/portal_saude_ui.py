@@ -9,6 +9,7 @@ de ano, mês e intervalos personalizados.
 import sys
 import os
 import time
+import subprocess
 import threading
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
@@ -17,6 +18,79 @@ from pathlib import Path
 from src.utils.logger import logger, set_context
 
 
+# Month names shared by summaries, filters and progress messages
+_MONTH_ABBR = ('Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez')
+_MONTH_NAMES = ('Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+                'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro')
+
+# Month picker menus, precomputed so each prompt is a single write
+_MONTHS_REQUIRED = (
+    "   1) Janeiro    2) Fevereiro   3) Marco\n"
+    "   4) Abril      5) Maio        6) Junho\n"
+    "   7) Julho      8) Agosto      9) Setembro\n"
+    "   10) Outubro   11) Novembro   12) Dezembro\n"
+)
+_MONTHS_WITH_ALL = (
+    _MONTHS_REQUIRED
+    + "   13) Todos os meses\n"
+    "   14) Intervalo personalizado de meses\n"
+)
+
+# Processing steps shown by the progress display, in screen order
+_STEPS = (
+    "Conectando ao site",
+    "Aplicando filtros",
+    "Carregando resultados",
+    "Baixando PDFs",
+    "Processamento AI",
+    "Finalizando"
+)
+
+
+# Static error logs screen, written in a single call
+_ERROR_LOGS_SCREEN = (
+    "========================================\n"
+    "         LOGS DE ERRO\n"
+    "========================================\n"
+    "\n"
+    "Logs detalhados salvos em: logs/\n"
+    "\n"
+    "Para análise técnica, verifique os arquivos de log.\n"
+    "\n"
+)
+
+# Static AI dependency help screen, written in a single call
+_DEPENDENCY_HELP_SCREEN = (
+    "========================================\n"
+    "         AJUDA - DEPENDÊNCIAS AI\n"
+    "========================================\n"
+    "\n"
+    "Para usar o processamento AI, você precisa:\n"
+    "\n"
+    "1. Instalar dependências Python:\n"
+    "   pip install -r requirements.txt\n"
+    "\n"
+    "2. Configurar API key OpenAI:\n"
+    "   - Crie/edite o arquivo .env na raiz do projeto\n"
+    "   - Adicione: OPENAI_API_KEY=sua_chave_aqui\n"
+    "   - Obtenha sua chave em: https://platform.openai.com/api-keys\n"
+    "\n"
+    "3. Verificar se o arquivo .env está no formato correto:\n"
+    "   OPENAI_API_KEY=sk-proj-...\n"
+    "   (sem espaços ao redor do =)\n"
+    "\n"
+    "4. Reiniciar o programa após configurar\n"
+    "\n"
+    "Dependências necessárias:\n"
+    "• pymupdf4llm - Para extração de texto de PDFs\n"
+    "• openai - Para processamento com IA\n"
+    "• pandas - Para manipulação de dados\n"
+    "• openpyxl - Para geração de Excel\n"
+    "\n"
+)
+
+
 class InteractiveProgressDisplay:
     """
     Interactive progress display with real-time updates.
@@ -44,6 +118,7 @@ class InteractiveProgressDisplay:
         self.running = False
         self.update_thread = None
         self.lock = threading.Lock()
+        self._stop_event = threading.Event()  # Wakes the update loop on stop()
         
         # Display state
         self.last_timer_line = ""
@@ -55,12 +130,14 @@ class InteractiveProgressDisplay:
         """Start the real-time update thread."""
         if not self.running:
             self.running = True
+            self._stop_event.clear()
             self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
             self.update_thread.start()
     
     def stop(self):
         """Stop the real-time update thread."""
         self.running = False
+        self._stop_event.set()
         if self.update_thread:
             self.update_thread.join(timeout=1)
     
@@ -98,7 +175,9 @@ class InteractiveProgressDisplay:
                 self._update_animation()
                 self.last_animation_update = current_time
             
-            time.sleep(0.5)
+            # Sleep until the next tick, returning at once if stop() is called
+            if self._stop_event.wait(0.5):
+                break
     
     def _update_timer(self):
         """Update only the timer line."""
@@ -130,18 +209,9 @@ class InteractiveProgressDisplay:
         """Update only the line with the current active step."""
         if not self.first_render:
             return  # Don't update before first render
-            
-        all_steps = [
-            "Conectando ao site",
-            "Aplicando filtros", 
-            "Carregando resultados",
-            "Baixando PDFs",
-            "Processamento AI",
-            "Finalizando"
-        ]
-        
-        if self.current_step in all_steps:
-            step_index = all_steps.index(self.current_step)
+        
+        if self.current_step in _STEPS:
+            step_index = _STEPS.index(self.current_step)
             line_number = self.steps_start_line + step_index
             
             # Build the step line with animation
@@ -181,21 +251,11 @@ class InteractiveProgressDisplay:
         print(self.last_timer_line)
         print("")
         
-        # Show process steps
-        print("Etapas do processo:")
-        
-        all_steps = [
-            "Conectando ao site",
-            "Aplicando filtros",
-            "Carregando resultados", 
-            "Baixando PDFs",
-            "Processamento AI",
-            "Finalizando"
-        ]
-        
-        for step_name in all_steps:
+        # Show process steps, built into a single block and written at once
+        step_lines = ["Etapas do processo:"]
+        for step_name in _STEPS:
             if step_name in self.steps_completed:
-                print(f"✓ {step_name}")
+                step_lines.append(f"✓ {step_name}")
             elif step_name == self.current_step:
                 # Initial render with animation
                 animation = self.animation_frames[self.animation_index]
@@ -204,11 +264,11 @@ class InteractiveProgressDisplay:
                     step_line += f" ({self.current_detail})"
                 if step_name == "Baixando PDFs" and self.pdf_total > 0:
                     step_line += f" ({self.pdf_current}/{self.pdf_total})"
-                print(step_line)
+                step_lines.append(step_line)
             else:
-                print(f"  {step_name}")
+                step_lines.append(f"  {step_name}")
         
-        print("")
+        sys.stdout.write("\n".join(step_lines) + "\n\n")
         print("Pressione Ctrl+C para cancelar")
         
         # Mark first render as complete and position cursor safely
@@ -232,18 +292,14 @@ class InteractiveProgressDisplay:
         # Handle month
         if self.config.get('month_range'):
             start_month, end_month = self.config['month_range']
-            months = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                     'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            start_name = months[start_month - 1]
-            end_name = months[end_month - 1]
+            start_name = _MONTH_ABBR[start_month - 1]
+            end_name = _MONTH_ABBR[end_month - 1]
             parts.append(f"Meses: {start_name}-{end_name}")
         elif 'month' in self.config:
             if self.config['month'] == 13:
                 parts.append("Mês: Todos")
             elif 1 <= self.config['month'] <= 12:
-                months = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                         'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                parts.append(f"Mês: {months[self.config['month']-1]}")
+                parts.append(f"Mês: {_MONTH_ABBR[self.config['month']-1]}")
         
         return " | ".join(parts) if parts else "Configuração padrão"
 
@@ -252,6 +308,21 @@ class PortalSaudeUI:
     """
     Interface do usuário específica para Portal Saude MG.
     """
+
+    # Accepted year bounds, computed once at import (current year + 20 ahead)
+    _YEAR_MIN = 2000
+    _YEAR_MAX = datetime.now().year + 20
+
+    # Scraper class, imported lazily on first run and reused afterwards
+    _scraper_cls = None
+    
+    @classmethod
+    def _get_scraper_cls(cls):
+        """Import the scraper class once and cache it on the class."""
+        if cls._scraper_cls is None:
+            from src.modules.sites.portal_saude_mg import PortalSaudeMGScraper
+            cls._scraper_cls = PortalSaudeMGScraper
+        return cls._scraper_cls
     
     def __init__(self, terminal_instance):
         self.terminal = terminal_instance
@@ -411,10 +482,8 @@ class PortalSaudeUI:
         
         if month_range:
             start_month, end_month = month_range
-            month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                         'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            start_name = month_names[start_month - 1]
-            end_name = month_names[end_month - 1]
+            start_name = _MONTH_ABBR[start_month - 1]
+            end_name = _MONTH_ABBR[end_month - 1]
             filters.append(f"Mês: {start_name}-{end_name}")
         elif month is not None:
             if month == 13:
@@ -422,9 +491,7 @@ class PortalSaudeUI:
             elif month == 14:
                 filters.append("Mês: Intervalo personalizado")
             elif 1 <= month <= 12:
-                month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                             'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                filters.append(f"Mês: {month_names[month-1]}")
+                filters.append(f"Mês: {_MONTH_ABBR[month-1]}")
         
         if filters:
             print("Filtros selecionados: " + " | ".join(filters))
@@ -552,11 +619,10 @@ class PortalSaudeUI:
                 return 998  # Keep internal value as 998
             
             # Allow any reasonable year (from 2000 to current year + 20)
-            current_year = datetime.now().year
-            if 2000 <= year <= current_year + 20:
+            if self._YEAR_MIN <= year <= self._YEAR_MAX:
                 return year
             else:
-                self.terminal.show_error(f"Ano deve estar entre 2000 e {current_year + 20}, 1 para todos os anos, ou 2 para intervalo.")
+                self.terminal.show_error(f"Ano deve estar entre {self._YEAR_MIN} e {self._YEAR_MAX}, 1 para todos os anos, ou 2 para intervalo.")
                 return None
         except ValueError:
             self.terminal.show_error("Entrada invalida. Digite um numero.")
@@ -564,20 +630,12 @@ class PortalSaudeUI:
 
     def get_month_input(self, prompt: str, required: bool = False) -> Optional[int]:
         """Get and validate month input."""
-        print(prompt)
-        print("   1) Janeiro    2) Fevereiro   3) Marco")
-        print("   4) Abril      5) Maio        6) Junho")
-        print("   7) Julho      8) Agosto      9) Setembro")
-        print("   10) Outubro   11) Novembro   12) Dezembro")
-        
-        if not required:
-            print("   13) Todos os meses")
-            print("   14) Intervalo personalizado de meses")
-            max_option = 14
+        if required:
+            menu, max_option = _MONTHS_REQUIRED, 12
         else:
-            max_option = 12
+            menu, max_option = _MONTHS_WITH_ALL, 14
         
-        print("")
+        sys.stdout.write(f"{prompt}\n{menu}\n")
         month_str = self._get_key_input(f"   Digite sua opcao (1-{max_option}): ")
         
         if month_str == self.ESC_PRESSED:
@@ -622,14 +680,12 @@ class PortalSaudeUI:
             return None
         
         # Validate range
-        current_year = datetime.now().year
-        
-        if not (2000 <= start_year <= current_year + 20):
-            self.terminal.show_error(f"Ano de início deve estar entre 2000 e {current_year + 20}.")
+        if not (self._YEAR_MIN <= start_year <= self._YEAR_MAX):
+            self.terminal.show_error(f"Ano de início deve estar entre {self._YEAR_MIN} e {self._YEAR_MAX}.")
             return None
             
-        if not (2000 <= end_year <= current_year + 20):
-            self.terminal.show_error(f"Ano de fim deve estar entre 2000 e {current_year + 20}.")
+        if not (self._YEAR_MIN <= end_year <= self._YEAR_MAX):
+            self.terminal.show_error(f"Ano de fim deve estar entre {self._YEAR_MIN} e {self._YEAR_MAX}.")
             return None
             
         if start_year > end_year:
@@ -682,11 +738,8 @@ class PortalSaudeUI:
             self.terminal.show_error("Mês de início deve ser menor ou igual ao mês de fim.")
             return None
         
-        month_names = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
-                      'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
-        
-        start_name = month_names[start_month - 1]
-        end_name = month_names[end_month - 1]
+        start_name = _MONTH_NAMES[start_month - 1]
+        end_name = _MONTH_NAMES[end_month - 1]
         
         print(f"   Intervalo configurado: {start_name} até {end_name} ({end_month - start_month + 1} meses)")
         return (start_month, end_month)
@@ -719,8 +772,7 @@ class PortalSaudeUI:
             progress.show_status("Conectando ao site", "Inicializando navegador")
             
             # Import and create scraper
-            from src.modules.sites.portal_saude_mg import PortalSaudeMGScraper
-            scraper = PortalSaudeMGScraper()
+            scraper = self._get_scraper_cls()()
             
             # Execute scraping with progress updates
             result = self._execute_scraping_with_callbacks(scraper, config, progress)
@@ -1180,9 +1232,9 @@ class PortalSaudeUI:
                 if sys.platform == "win32":
                     os.startfile(path)
                 elif sys.platform == "darwin":
-                    os.system(f"open '{path}'")
+                    subprocess.Popen(['open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 else:
-                    os.system(f"xdg-open '{path}'")
+                    subprocess.Popen(['xdg-open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             else:
                 print(f"Pasta nao encontrada: {path}")
         except Exception as e:
@@ -1193,14 +1245,9 @@ class PortalSaudeUI:
     def show_error_logs(self):
         """Show error logs."""
         self.terminal.clear_screen()
-        print("========================================")
-        print("         LOGS DE ERRO")
-        print("========================================")
-        print("")
-        print("Logs detalhados salvos em: logs/")
-        print("")
-        print("Para análise técnica, verifique os arquivos de log.")
-        print("")
+        sys.stdout.write(_ERROR_LOGS_SCREEN)
+        sys.stdout.flush()
+        
         input("Pressione Enter para continuar...")
 
     def open_excel_file(self, excel_path: str = None):
@@ -1214,9 +1261,9 @@ class PortalSaudeUI:
             if sys.platform == "win32":
                 os.startfile(excel_path)
             elif sys.platform == "darwin":
-                os.system(f"open '{excel_path}'")
+                subprocess.Popen(['open', excel_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             else:
-                os.system(f"xdg-open '{excel_path}'")
+                subprocess.Popen(['xdg-open', excel_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 
             print(f"Abrindo arquivo: {excel_path}")
             
@@ -1305,32 +1352,8 @@ class PortalSaudeUI:
     def show_dependency_help_screen(self):
         """Show help screen for installing AI dependencies."""
         self.terminal.clear_screen()
-        print("========================================")
-        print("         AJUDA - DEPENDÊNCIAS AI")
-        print("========================================")
-        print("")
-        print("Para usar o processamento AI, você precisa:")
-        print("")
-        print("1. Instalar dependências Python:")
-        print("   pip install -r requirements.txt")
-        print("")
-        print("2. Configurar API key OpenAI:")
-        print("   - Crie/edite o arquivo .env na raiz do projeto")
-        print("   - Adicione: OPENAI_API_KEY=sua_chave_aqui")
-        print("   - Obtenha sua chave em: https://platform.openai.com/api-keys")
-        print("")
-        print("3. Verificar se o arquivo .env está no formato correto:")
-        print("   OPENAI_API_KEY=sk-proj-...")
-        print("   (sem espaços ao redor do =)")
-        print("")
-        print("4. Reiniciar o programa após configurar")
-        print("")
-        print("Dependências necessárias:")
-        print("• pymupdf4llm - Para extração de texto de PDFs")
-        print("• openai - Para processamento com IA")
-        print("• pandas - Para manipulação de dados")
-        print("• openpyxl - Para geração de Excel")
-        print("")
+        sys.stdout.write(_DEPENDENCY_HELP_SCREEN)
+        sys.stdout.flush()
         
         input("Pressione Enter para continuar...")
     
@@ -1354,10 +1377,8 @@ class PortalSaudeUI:
         # Handle month or month range
         if config.get('month_range'):
             start_month, end_month = config['month_range']
-            months = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                     'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            start_name = months[start_month - 1]
-            end_name = months[end_month - 1]
+            start_name = _MONTH_ABBR[start_month - 1]
+            end_name = _MONTH_ABBR[end_month - 1]
             parts.append(f"Mes: {start_name}-{end_name}")
         elif 'month' in config:
             if config['month'] == 13:
@@ -1365,9 +1386,7 @@ class PortalSaudeUI:
             elif config['month'] == 14:
                 parts.append("Mes: Intervalo personalizado")
             elif 1 <= config['month'] <= 12:
-                months = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                         'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                parts.append(f"Mes: {months[config['month']-1]}")
+                parts.append(f"Mes: {_MONTH_ABBR[config['month']-1]}")
         
         if 'municipality' in config:
             if config['municipality'] == 'ALL_MG':
@@ -1403,8 +1422,7 @@ class PortalSaudeUI:
         if month_range:
             start_month, end_month = month_range
             months_to_process = list(range(start_month, end_month + 1))
-            month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            range_desc += f", Meses {month_names[start_month-1]}-{month_names[end_month-1]}"
+            range_desc += f", Meses {_MONTH_ABBR[start_month-1]}-{_MONTH_ABBR[end_month-1]}"
         elif config.get('month') == 13:
             months_to_process = list(range(1, 13))
             range_desc += ", Todos os meses"
@@ -1426,7 +1444,7 @@ class PortalSaudeUI:
                     mes = None
                 else:
                     mes = f"{month:02d}"
-                    mes_desc = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez'][month-1]
+                    mes_desc = _MONTH_ABBR[month-1]
                 
                 set_context(year=ano, month=mes)
                 
@@ -1562,15 +1580,13 @@ class PortalSaudeUI:
         total_files_found = 0
         months_processed = 0
         
-        month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        
         logger.info(f"Processando Todos os Meses de {ano}")
         
         set_context(year=ano)
         
         for month_num in range(1, 13):
             mes = f"{month_num:02d}"
-            month_name = month_names[month_num - 1]
+            month_name = _MONTH_ABBR[month_num - 1]
             
             set_context(year=ano, month=mes)
             logger.info(f"Processando {month_name}/{ano}")
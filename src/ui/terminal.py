@@ -8,10 +8,18 @@ Simple, focused terminal interface for extracting data from three Brazilian gove
 3. MDS - Saldo Detalhado por Conta
 
 This interface provides the exact user experience specified in the requirements.
+
+Performance notes:
+- The hot path is blocking I/O: stdin reads, stdout writes and process spawns.
+- Numba/Cython/SIMD do not apply here; there are no numeric kernels.
+- Useful levers are ANSI redraws instead of shelling out to cls/clear,
+  batched writes of precomputed strings and lazy imports.
 """
 
 import os
+import sys
 import shutil
+from collections import namedtuple
 from typing import Dict, Any
 
 from .portal_saude_ui import PortalSaudeUI
@@ -20,37 +28,81 @@ from .mds_saldo_ui import MDSSaldoUI
 from src.utils.parallel_runner import run_all_sites_parallel
 
 
+Site = namedtuple('Site', 'name url handler')
+
+# Site definitions, zero-indexed (menu option N maps to _SITES[N - 1])
+_SITES = (
+    Site(
+        'Portal Saude MG - Resoluções',
+        'https://portal-antigo.saude.mg.gov.br/deliberacoes/documents?by_year=0&by_month=&by_format=pdf&category_id=4795&ordering=newest&q=',
+        'portal_saude_mg'
+    ),
+    Site(
+        'MDS - Parcelas Pagas',
+        'https://aplicacoes.mds.gov.br/suaswebcons/restrito/execute.jsf?b=*dpotvmubsQbsdfmbtQbhbtNC&event=*fyjcjs',
+        'mds_parcelas'
+    ),
+    Site(
+        'MDS - Saldo Detalhado por Conta',
+        'https://aplicacoes.mds.gov.br/suaswebcons/restrito/execute.jsf?b=*tbmepQbsdfmbtQbhbtNC&event=*fyjcjs',
+        'mds_saldo'
+    ),
+)
+
+# Static main menu, written in a single call on every redraw
+_MENU_MAIN = (
+    "========================================\n"
+    "    WEB SCRAPER AUTOMATIZADO\n"
+    "========================================\n"
+    "\n"
+    "Selecione o site para coleta de dados:\n"
+    "\n"
+    + "".join(f"{i}. {site.name}\n" for i, site in enumerate(_SITES, 1))
+    + "4. Sair\n"
+    "5. Executar Todos os Sites (Paralelo)\n"
+    "\n"
+    "11. Limpar Downloads\n"
+    "\n"
+)
+
+
 class BrazilianSitesTerminal:
     """
     Main terminal interface for Brazilian government sites data extraction.
     """
+
+    # ANSI sequence: cursor home, clear screen, clear scrollback
+    _CLEAR_SEQUENCE = "\x1b[H\x1b[2J\x1b[3J"
+
+    # Whether the terminal understands ANSI clear (resolved once per process)
+    _ansi_clear = None
     
     def __init__(self):
         self.running = True
+
+        # Detect ANSI support once so every redraw skips the shell fork
+        if BrazilianSitesTerminal._ansi_clear is None:
+            BrazilianSitesTerminal._ansi_clear = self._detect_ansi_clear()
         
-        # Site definitions
-        self.sites = {
-            1: {
-                'name': 'Portal Saude MG - Resoluções',
-                'url': 'https://portal-antigo.saude.mg.gov.br/deliberacoes/documents?by_year=0&by_month=&by_format=pdf&category_id=4795&ordering=newest&q=',
-                'handler': 'portal_saude_mg'
-            },
-            2: {
-                'name': 'MDS - Parcelas Pagas',
-                'url': 'https://aplicacoes.mds.gov.br/suaswebcons/restrito/execute.jsf?b=*dpotvmubsQbsdfmbtQbhbtNC&event=*fyjcjs',
-                'handler': 'mds_parcelas'
-            },
-            3: {
-                'name': 'MDS - Saldo Detalhado por Conta',
-                'url': 'https://aplicacoes.mds.gov.br/suaswebcons/restrito/execute.jsf?b=*tbmepQbsdfmbtQbhbtNC&event=*fyjcjs',
-                'handler': 'mds_saldo'
-            }
-        }
+        # Site definitions (immutable, shared across instances)
+        self.sites = _SITES
         
         # Initialize UI components
         self.portal_saude_ui = PortalSaudeUI(self)
         self.mds_parcelas_ui = MDSParcelasUI(self)
         self.mds_saldo_ui = MDSSaldoUI(self)
+        
+        # Site UIs in menu order (option N maps to index N - 1)
+        self._site_uis = (self.portal_saude_ui, self.mds_parcelas_ui, self.mds_saldo_ui)
+        
+        # Menu option -> action; exit (4) is handled separately since it returns
+        self._actions = {
+            1: self._site_uis[0].execute_complete_flow,
+            2: self._site_uis[1].execute_complete_flow,
+            3: self._site_uis[2].execute_complete_flow,
+            5: lambda: run_all_sites_parallel(*self._site_uis),
+            11: self.clear_downloads,
+        }
 
     def start(self) -> Dict[str, Any]:
         """Start the terminal interface."""
@@ -65,16 +117,10 @@ class BrazilianSitesTerminal:
                         self.clear_logs()
                         self.running = False
                         return {'status': 'exit', 'message': 'Saindo...'}
-                    elif choice_num in [1, 2, 3]:
-                        self.handle_site_selection(choice_num)
-                    elif choice_num == 5:
-                        run_all_sites_parallel(
-                            self.portal_saude_ui, 
-                            self.mds_parcelas_ui, 
-                            self.mds_saldo_ui
-                        )
-                    elif choice_num == 11:
-                        self.clear_downloads()
+                    
+                    action = self._actions.get(choice_num)
+                    if action:
+                        action()
                     else:
                         self.show_error("Opcao invalida. Tente novamente.")
                 except ValueError:
@@ -90,34 +136,50 @@ class BrazilianSitesTerminal:
     def show_main_menu(self):
         """Show the main menu."""
         self.clear_screen()
-        print("========================================")
-        print("    WEB SCRAPER AUTOMATIZADO")
-        print("========================================")
-        print("")
-        print("Selecione o site para coleta de dados:")
-        print("")
-        print("1. Portal Saude MG - Resoluções")
-        print("2. MDS - Parcelas Pagas")
-        print("3. MDS - Saldo Detalhado por Conta")
-        print("4. Sair")
-        print("5. Executar Todos os Sites (Paralelo)")
-        print("")
-        print("11. Limpar Downloads")
-        print("")
+        sys.stdout.write(_MENU_MAIN)
+        sys.stdout.flush()
 
     def handle_site_selection(self, site_num: int):
         """Handle site selection and delegate to appropriate UI."""
-        if site_num == 1:
-            self.portal_saude_ui.execute_complete_flow()
-        elif site_num == 2:
-            self.mds_parcelas_ui.execute_complete_flow()
-        elif site_num == 3:
-            self.mds_saldo_ui.execute_complete_flow()
+        if 1 <= site_num <= len(self._site_uis):
+            self._site_uis[site_num - 1].execute_complete_flow()
+
+    @staticmethod
+    def _detect_ansi_clear() -> bool:
+        """Check if stdout is a TTY able to handle ANSI escape sequences."""
+        try:
+            if not sys.stdout.isatty():
+                return False
+        except (AttributeError, ValueError):
+            return False
 
+        if os.name != 'nt':
+            return True
+
+        # Windows 10+: enable ENABLE_VIRTUAL_TERMINAL_PROCESSING on the console
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+            mode = ctypes.c_uint32()
+            if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                return False
+            return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+        except Exception:
+            return False
 
     def clear_screen(self):
         """Clear the terminal screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self._ansi_clear:
+            sys.stdout.write(self._CLEAR_SEQUENCE)
+            sys.stdout.flush()
+        else:
+            # Fallback for consoles without ANSI support
+            os.system('cls' if os.name == 'nt' else 'clear')
+
+    def clear_sequence(self) -> str:
+        """ANSI clear sequence to prepend to buffered output ('' when clear_screen must be used)."""
+        return self._CLEAR_SEQUENCE if self._ansi_clear else ""
 
     def get_user_input(self, prompt: str) -> str:
         """Get user input with prompt."""
@@ -127,6 +189,15 @@ class BrazilianSitesTerminal:
         """Show error message and wait for user."""
         print(f"\nErro: {message}")
         input("Pressione Enter para continuar...")
+
+    def show_inline_error(self, message: str):
+        """Show error message in red and return immediately, for retry loops."""
+        if self._ansi_clear:
+            sys.stdout.write(f"\n\x1b[31mErro: {message}\x1b[0m\n")
+        else:
+            # No ANSI support: plain text instead of raw escape codes
+            sys.stdout.write(f"\nErro: {message}\n")
+        sys.stdout.flush()
     
     def clear_downloads(self):
         """Clear all files in downloads/processed and downloads/raw folders."""
@@ -173,7 +173,21 @@ class Logger:
         """Start a new logging session with dedicated files."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_id = f"{session_type}_{timestamp}"
+        self._attach_session_handlers()
         
+        self.info(f"=== SESSÃO INICIADA: {self.session_id} ===")
+        return self.session_id
+    
+    def resume_session(self, session_id: str) -> str:
+        """Reopen an earlier session, appending to its existing files."""
+        self.session_id = session_id
+        self._attach_session_handlers()
+        
+        self.info(f"=== SESSÃO RETOMADA: {self.session_id} ===")
+        return self.session_id
+    
+    def _attach_session_handlers(self) -> None:
+        """Add the session log and session error log handlers for self.session_id."""
         # Create session-specific log file
         session_filename = self.logs_dir / f'{self.session_id}.log'
         session_handler = RotatingFileHandler(
@@ -203,9 +217,6 @@ class Logger:
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(session_formatter)
         self._logger.addHandler(error_handler)
-        
-        self.info(f"=== SESSÃO INICIADA: {self.session_id} ===")
-        return self.session_id
     
     def end_session(self) -> None:
         """End current logging session and remove session handlers."""